@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+# =============================
+# Agent startup helpers
+# =============================
+# The agent scripts used to pull "hwchase17/react" from the LangChain hub and
+# build the LLM and AgentExecutor at import time, so every start paid a
+# network round trip and the heavy langchain/openai imports before the first
+# input() prompt. This module provides:
+#   pull_prompt   hub prompts cached on disk per name and version, refreshed
+#                 after `max_age`, with the stale copy (or a bundled template)
+#                 used when the hub cannot be reached
+#   Lazy          builds an object on first attribute access
+#   importtime    `python -X importtime` profile of an entry point
+#
+#   python agent_startup.py langchain_agent langchain_agent_with_google_maps -o importtime.json
+
+PROMPT_CACHE_DIR = os.getenv("PROMPT_CACHE_DIR", ".prompt_cache")
+PROMPT_MAX_AGE = float(os.getenv("PROMPT_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+
+# Used when the hub is unreachable and nothing is cached yet
+BUNDLED_PROMPTS = {
+    "hwchase17/react": """Answer the following questions as best you can. You have access to the following tools:
+
+{tools}
+
+Use the following format:
+
+Question: the input question you must answer
+Thought: you should always think about what to do
+Action: the action to take, should be one of [{tool_names}]
+Action Input: the input to the action
+Observation: the result of the action
+... (this Thought/Action/Action Input/Observation can repeat N times)
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question
+
+Begin!
+
+Question: {input}
+Thought:{agent_scratchpad}""",
+}
+
+
+# =============================
+# Hub prompt cache
+# =============================
+
+def _prompt_cache_path(name: str, cache_dir: str) -> str:
+    """'owner/repo:commit' -> <cache_dir>/owner__repo/<commit or latest>.json"""
+    repo, _, version = name.partition(":")
+    return os.path.join(cache_dir, repo.replace("/", "__"), f"{version or 'latest'}.json")
+
+
+def pull_prompt(name: str, cache_dir: str = PROMPT_CACHE_DIR, max_age: float = PROMPT_MAX_AGE,
+                offline: Optional[bool] = None):
+    """hub.pull() with a local cache; pinned versions ('owner/repo:commit') never expire."""
+    from langchain_core.load import dumpd, load
+
+    if offline is None:
+        offline = bool(os.getenv("PROMPT_CACHE_OFFLINE"))
+    path = _prompt_cache_path(name, cache_dir)
+    cached = None
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+        fresh = ":" in name or time.time() - cached["fetched_at"] < max_age
+        if fresh or offline:
+            return load(cached["prompt"])
+
+    if not offline:
+        try:
+            from langchain import hub
+            prompt = hub.pull(name)
+        except Exception as exc:
+            print(f"Prompt hub unavailable ({type(exc).__name__}), using a local copy of {name}", file=sys.stderr)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"name": name, "fetched_at": time.time(), "prompt": dumpd(prompt)}, f)
+            os.replace(f"{path}.tmp", path)
+            return prompt
+
+    if cached is not None:
+        return load(cached["prompt"])
+    repo = name.partition(":")[0]
+    if repo in BUNDLED_PROMPTS:
+        from langchain_core.prompts import PromptTemplate
+        return PromptTemplate.from_template(BUNDLED_PROMPTS[repo])
+    raise LookupError(f"Prompt {name!r} is not cached and the hub is unavailable")
+
+
+# =============================
+# Lazy construction
+# =============================
+
+class Lazy:
+    """Proxy that calls `factory` on first use and then forwards attribute access to the result."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self._factory()
+        return self._value
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+# =============================
+# Import-time profile
+# =============================
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S.*)$")
+
+
+def importtime(module: str, top: int = 15) -> dict:
+    """Run `python -X importtime -c 'import <module>'` and summarise the slowest imports.
+
+    The module is imported with stdin closed, so entry points that prompt for
+    input stop there instead of waiting.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    wall = time.perf_counter() - start
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({"module": name, "self_ms": int(self_us) / 1000,
+                            "cumulative_ms": int(cumulative_us) / 1000, "depth": len(indent) // 2})
+    top_level = [entry for entry in entries if entry["depth"] == 0]
+    return {"module": module, "ok": proc.returncode == 0, "wall_s": round(wall, 3),
+            "import_ms": round(sum(entry["cumulative_ms"] for entry in top_level), 1),
+            "slowest": sorted(top_level, key=lambda entry: entry["cumulative_ms"], reverse=True)[:top]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the import time of the agent entry points.")
+    parser.add_argument("modules", nargs="*", default=["langchain_agent", "langchain_agent_with_google_maps",
+                                                       "langchain_agent_with_tools_Streamlit"])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("-o", "--output", help="write the profiles as JSON")
+    args = parser.parse_args()
+
+    profiles = [importtime(module, args.top) for module in args.modules]
+    for profile in profiles:
+        print(f"{profile['module']}: {profile['import_ms']} ms imports, {profile['wall_s']} s wall"
+              f"{'' if profile['ok'] else ' (import failed)'}")
+        for entry in profile["slowest"][:5]:
+            print(f"  {entry['cumulative_ms']:9.1f} ms  {entry['module']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
@@ -0,0 +1,168 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+from langchain_core.tools import tool
+
+from geo_prefilter import DriveTimePrefilter, parse_coordinates
+from http_client import GOOGLE_MAPS_BASE_URL, OPENWEATHER_BASE_URL, WIKIPEDIA_API_URL, http_client
+from tool_cache import DAY, HOUR, MINUTE, ToolFailure, tool_cache
+
+# =============================
+# Agent tools
+# =============================
+# The weather, geocoding, drive-time and Wikipedia tools shared by the agent
+# scripts (langchain_agent.py, langchain_agent_with_google_maps.py, the
+# Streamlit planner and attractions_planner_graph.py). Every tool goes through
+# the pooled http_client and the tool_cache, and reports failures as
+# ToolFailure so they are never cached.
+
+load_dotenv()
+OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
+GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+
+
+@tool
+@tool_cache.cached("weather", ttl=10 * MINUTE)
+def get_weather(city: str) -> str:
+    """
+    Get current weather for a city from the OpenWeather API.
+    Returns a string like: 'Paris: sunny, 25°C'
+    """
+    url = f"{OPENWEATHER_BASE_URL}/data/2.5/weather"
+    print("Weather API URL:", url)
+    try:
+        response = http_client.get(url, params={"q": city, "appid": OPENWEATHER_API_KEY, "units": "metric"})
+    except requests.RequestException:
+        return ToolFailure(f"Weather data not available for {city}.")
+    if response.status_code != 200:
+        return ToolFailure(f"Weather data not available for {city}.")
+    data = response.json()
+    desc = data["weather"][0]["description"]
+    temp = data["main"]["temp"]
+    return f"{city}: {desc}, {temp}°C"
+
+
+@tool
+@tool_cache.cached("geocode", ttl=30 * DAY)
+def get_coordinates(address: str) -> str:
+    """
+    Get latitude and longitude for an address using Google Maps Geocoding API.
+    Returns a string 'lat,lon' or 'Coordinates not found.'
+    """
+    url = f"{GOOGLE_MAPS_BASE_URL}/maps/api/geocode/json"
+    print("Geocode API URL:", url)
+    try:
+        r = http_client.get(url, params={"address": address, "key": GOOGLE_MAPS_API_KEY})
+    except requests.RequestException:
+        return ToolFailure("Coordinates not found.")
+    if r.status_code != 200:
+        return ToolFailure("Coordinates not found.")
+    result = r.json()
+    if not result.get("results"):
+        return ToolFailure("Coordinates not found.")
+    location = result["results"][0]["geometry"]["location"]
+    return f"{location['lat']},{location['lng']}"
+
+
+# The Distance Matrix API accepts up to 25 destinations per request
+MAX_DESTINATIONS_PER_REQUEST = 25
+# Attractions further than this from home are not worth suggesting
+MAX_DRIVE_MINUTES = 60
+
+# Destinations that cannot be within MAX_DRIVE_MINUTES even in a straight line at motorway
+# speed are answered from (cached) geocodes instead of the Distance Matrix API. Opt-in with
+# GEO_PREFILTER=1: since get_drive_times sends one batched request, the filter saves Distance
+# Matrix elements but a whole request only when every destination is too far, and on a cold
+# cache it costs one geocode request per address. Its stats report the net saving.
+drive_time_prefilter = None
+if os.getenv("GEO_PREFILTER", "0") != "0":
+    drive_time_prefilter = DriveTimePrefilter(cutoff_minutes=MAX_DRIVE_MINUTES)
+
+
+def _prefilter(origin: str, destinations: list):
+    """({destination: lower bound or None} to send to the API, {destination: lower bound} to skip)."""
+    if drive_time_prefilter is None:
+        return dict.fromkeys(destinations), {}
+
+    def geocode(address: str):
+        coordinates = parse_coordinates(get_coordinates.invoke(address))
+        # Cache misses are real geocode requests, which count against the filter's saving
+        drive_time_prefilter.record_geocodes(int(tool_cache.last_call_fetched()))
+        return coordinates
+
+    origin_coordinates = geocode(origin)
+    if origin_coordinates is None:
+        return drive_time_prefilter.split(None, dict.fromkeys(destinations))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        coordinates = pool.map(geocode, destinations)
+        return drive_time_prefilter.split(origin_coordinates, dict(zip(destinations, coordinates)))
+
+
+@tool
+@tool_cache.cached("drive_times", ttl=HOUR)
+def get_drive_times(addresses: str) -> str:
+    """
+    Get driving times in minutes from one start address to several destinations in a single call,
+    using Google Maps Distance Matrix API.
+    Expects input: "start_address|dest_address_1|dest_address_2|..."
+    Returns JSON: {"origin": ..., "drive_times": [{"destination": ..., "minutes": 45.2}, ...]}.
+    Destinations without a route have "error" instead of "minutes"; destinations that are clearly
+    more than 60 minutes away have "minutes_at_least" instead.
+    """
+    parts = [a.strip() for a in addresses.split("|") if a.strip()]
+    if len(parts) < 2:
+        return ToolFailure("Invalid input format, expected 'start_address|dest_address_1|dest_address_2|...'.")
+    origin, destinations = parts[0], list(dict.fromkeys(parts[1:]))
+
+    bounds, beyond = _prefilter(origin, destinations)
+    queried = list(bounds)
+    url = f"{GOOGLE_MAPS_BASE_URL}/maps/api/distancematrix/json"
+    print("Distance Matrix API URL:", url)
+
+    results = {name: {"destination": name, "minutes_at_least": bound} for name, bound in beyond.items()}
+    for start in range(0, len(queried), MAX_DESTINATIONS_PER_REQUEST):
+        batch = queried[start:start + MAX_DESTINATIONS_PER_REQUEST]
+        params = {"origins": origin, "destinations": "|".join(batch), "mode": "driving", "key": GOOGLE_MAPS_API_KEY}
+        try:
+            r = http_client.get(url, params=params)
+        except requests.RequestException:
+            return ToolFailure("Error fetching distance data.")
+        if r.status_code != 200:
+            return ToolFailure("Error fetching distance data.")
+        data = r.json()
+        if data.get("status") != "OK":
+            return ToolFailure(f"Error in API response: {data.get('status')}")
+
+        try:
+            elements = data["rows"][0]["elements"]
+        except (IndexError, KeyError):
+            return ToolFailure("Driving time data not found.")
+        for destination, element in zip(batch, elements):
+            if element.get("status") == "OK":
+                results[destination] = {"destination": destination,
+                                        "minutes": round(element["duration"]["value"] / 60, 1)}
+                if drive_time_prefilter is not None:
+                    drive_time_prefilter.record(bounds[destination], results[destination]["minutes"])
+            else:
+                results[destination] = {"destination": destination, "error": element.get("status", "NOT_FOUND")}
+
+    return json.dumps({"origin": origin, "drive_times": [results[name] for name in destinations if name in results]})
+
+
+@tool
+@tool_cache.cached("wiki_summary", ttl=30 * DAY)
+def wiki_summary(place: str) -> str:
+    """
+    Get a 3-line Wikipedia summary for a place.
+    """
+    # MediaWiki API through the pooled client: best search match, first 3 sentences of its intro
+    params = {"action": "query", "format": "json", "generator": "search", "gsrsearch": place, "gsrlimit": 1,
+              "prop": "extracts", "exintro": 1, "explaintext": 1, "exsentences": 3, "redirects": 1}
+    try:
+        pages = http_client.get(WIKIPEDIA_API_URL, params=params).json()["query"]["pages"]
+        return next(iter(pages.values()))["extract"]
+    except Exception:
+        return ToolFailure(f"No Wikipedia info found for {place}.")
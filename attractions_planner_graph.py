@@ -0,0 +1,157 @@
+import json
+import operator
+import os
+import time
+from typing import Dict, List, Optional
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated, TypedDict
+
+from agent_startup import Lazy
+from agent_tools import MAX_DRIVE_MINUTES, drive_time_prefilter, get_drive_times, get_weather, wiki_summary
+from perf_callbacks import perf_config
+from tool_cache import ToolFailure
+
+# =============================
+# Attractions planner graph
+# =============================
+# Same workflow as the 7-step task in langchain_agent_with_google_maps.py,
+# but the control flow is a LangGraph StateGraph instead of GPT-4 decisions:
+#
+#   START -> weather ──────────────────────────────────────────────────────┐
+#         -> candidates -> drive_times -> select -> wiki x 2 (Send) -> write_up -> END
+#                ^                          │
+#                └── fewer than 2 qualify ──┘
+#
+# The model is only used to suggest candidates and to write the final answer.
+# Each round checks its new candidates with one batched get_drive_times call
+# (a single Distance Matrix request), so a retry round only checks the new
+# candidates. Summaries fan out in parallel, one tool call per chosen
+# attraction.
+#
+#   python attractions_planner_graph.py
+
+MIN_QUALIFYING = 2
+CANDIDATES_PER_ROUND = 5
+MAX_ROUNDS = 3
+
+
+class Candidates(BaseModel):
+    """Attractions to consider visiting."""
+    attractions: List[str] = Field(description="names of attractions, without the city name")
+
+
+class PlannerState(TypedDict):
+    home_address: str
+    city: str
+    weather: str
+    candidates: List[str]
+    rounds: int
+    # attraction -> drive minutes (None = no route or clearly too far); merged across rounds
+    drive_minutes: Annotated[Dict[str, Optional[float]], operator.or_]
+    chosen: List[str]
+    summaries: Annotated[Dict[str, str], operator.or_]
+    llm_calls: Annotated[int, operator.add]
+    answer: str
+
+
+def build_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=os.getenv("PLANNER_MODEL", "gpt-4"), temperature=0)
+
+
+llm = Lazy(build_llm)
+
+
+# ----- Nodes -----
+
+def weather(state: PlannerState):
+    return {"weather": get_weather.invoke(state["city"])}
+
+
+def candidates(state: PlannerState):
+    checked = list(state.get("drive_minutes") or {})
+    request = (f"Suggest {CANDIDATES_PER_ROUND} well-known attractions in {state['city']} worth visiting today, "
+               "mixing indoor and outdoor places.")
+    if checked:
+        request += f" Do not suggest any of these: {', '.join(checked)}."
+    suggested = llm.with_structured_output(Candidates).invoke(request).attractions
+    fresh = [name for name in dict.fromkeys(suggested) if name not in checked][:CANDIDATES_PER_ROUND]
+    return {"candidates": fresh, "rounds": state.get("rounds", 0) + 1, "llm_calls": 1}
+
+
+def drive_times(state: PlannerState):
+    """Checks all of this round's candidates in one batched tool call."""
+    city = state["city"]
+    names = list(dict.fromkeys(state["candidates"]))
+    minutes = dict.fromkeys(names)
+    if names:
+        result = get_drive_times.invoke("|".join([f"{state['home_address']}, {city}",
+                                                  *(f"{name}, {city}" for name in names)]))
+        if not isinstance(result, ToolFailure):
+            # Entries come back in input order; a cached result may echo another caller's spelling
+            for name, entry in zip(names, json.loads(result)["drive_times"]):
+                minutes[name] = entry.get("minutes")
+    return {"drive_minutes": minutes}
+
+
+def select(state: PlannerState):
+    reachable = sorted((minutes, name) for name, minutes in state["drive_minutes"].items()
+                       if minutes is not None and minutes <= MAX_DRIVE_MINUTES)
+    return {"chosen": [name for _, name in reachable[:MIN_QUALIFYING]]}
+
+
+def wiki(task: dict):
+    """Runs once per chosen attraction (via Send)."""
+    return {"summaries": {task["attraction"]: wiki_summary.invoke(f"{task['attraction']}, {task['city']}")}}
+
+
+def write_up(state: PlannerState):
+    lines = [f"Weather: {state['weather']}"]
+    for name in state["chosen"]:
+        lines.append(f"- {name}: {state['drive_minutes'][name]} min drive. {state['summaries'].get(name, '')}")
+    if len(state["chosen"]) < MIN_QUALIFYING:
+        lines.append(f"Only {len(state['chosen'])} attraction(s) found within {MAX_DRIVE_MINUTES} minutes.")
+    response = llm.invoke(
+        "Write a short plan for today from these facts: the weather, the chosen attractions with their "
+        "drive times, and a 3-line summary of each.\n\n" + "\n".join(lines))
+    return {"answer": response.content, "llm_calls": 1}
+
+
+# ----- Routing -----
+
+def enough_or_retry(state: PlannerState):
+    if len(state["chosen"]) < MIN_QUALIFYING and state["rounds"] < MAX_ROUNDS:
+        return "candidates"
+    if not state["chosen"]:
+        return "write_up"
+    return [Send("wiki", {"city": state["city"], "attraction": name}) for name in state["chosen"]]
+
+
+graph_builder = StateGraph(PlannerState)
+for node in (weather, candidates, drive_times, select, wiki, write_up):
+    graph_builder.add_node(node)
+graph_builder.add_edge(START, "weather")
+graph_builder.add_edge(START, "candidates")
+graph_builder.add_edge("candidates", "drive_times")
+graph_builder.add_edge("drive_times", "select")
+graph_builder.add_conditional_edges("select", enough_or_retry, ["candidates", "wiki", "write_up"])
+# write_up waits for both the weather and the summaries
+graph_builder.add_edge(["weather", "wiki"], "write_up")
+graph_builder.add_edge("write_up", END)
+graph = graph_builder.compile()
+
+
+if __name__ == "__main__":
+    home_address = input("Enter your home address: ").strip()
+    city_name = input("Enter the city name: ").strip()
+
+    start = time.perf_counter()
+    result = graph.invoke({"home_address": home_address, "city": city_name}, config=perf_config())
+    print("\nFinal Result:\n", result["answer"])
+    print(f"\n{result['llm_calls']} LLM calls, {result['rounds']} candidate round(s), "
+          f"{len(result['drive_minutes'])} drive-time checks, {time.perf_counter() - start:.1f}s")
+    if drive_time_prefilter is not None:
+        print("Drive-time pre-filter:", drive_time_prefilter.stats())
@@ -0,0 +1,94 @@
+import argparse
+import contextlib
+import importlib
+import json
+import sys
+import time
+from itertools import islice
+from typing import Iterator, TextIO
+
+from langchain_core.runnables import RunnableLambda
+
+from perf_callbacks import perf_config
+
+# =============================
+# Batch question answering
+# =============================
+# Runs many questions through the compiled `graph` of jobsearch_helper.py or
+# langchain_simple_rag.py. The index is built once when the graph module is
+# imported and shared by every question.
+#
+#   python batch_qa.py questions.txt -o answers.jsonl --concurrency 8
+#   cat questions.txt | python batch_qa.py - --graph jobsearch_helper
+#
+# Questions are read one per line and processed in windows, so stdin can be a
+# long-running stream. Answers are written as JSONL in submission order.
+
+
+def read_questions(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def run_batch(graph, questions: Iterator[str], out: TextIO, concurrency: int = 8, window: int = 64) -> dict:
+    def answer(item):
+        index, question = item
+        start = time.perf_counter()
+        try:
+            result = graph.invoke({"question": question}, config=perf_config())
+            record = {"index": index, "question": question, "answer": result["answer"]}
+        except Exception as exc:
+            record = {"index": index, "question": question, "error": f"{type(exc).__name__}: {exc}"}
+        record["latency_s"] = round(time.perf_counter() - start, 3)
+        return record
+
+    # batch() keeps results in input order while running up to `concurrency` questions at once
+    runner = RunnableLambda(answer)
+    numbered = enumerate(questions)
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    while items := list(islice(numbered, window)):
+        for record in runner.batch(items, config={"max_concurrency": concurrency}):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            latencies.append(record["latency_s"])
+            errors += "error" in record
+        out.flush()
+
+    return {"questions": len(latencies), "errors": errors,
+            "wall_s": round(time.perf_counter() - start, 3),
+            "p50_s": percentile(latencies, 50), "p95_s": percentile(latencies, 95),
+            "max_s": max(latencies, default=0.0)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Answer a file or stream of questions with a RAG graph.")
+    parser.add_argument("questions", help="file with one question per line, or - for stdin")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--graph", default="langchain_simple_rag",
+                        choices=["langchain_simple_rag", "jobsearch_helper"])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--window", type=int, default=64, help="questions read ahead per batch")
+    args = parser.parse_args()
+
+    # Index-build chatter goes to stderr so stdout stays valid JSONL
+    with contextlib.redirect_stdout(sys.stderr):
+        graph = importlib.import_module(args.graph).graph
+    source = sys.stdin if args.questions == "-" else open(args.questions, encoding="utf-8")
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        summary = run_batch(graph, read_questions(source), out, args.concurrency, args.window)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps(summary), file=sys.stderr)
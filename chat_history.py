@@ -0,0 +1,131 @@
+import threading
+from typing import Callable, List, Sequence
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from embedding_pipeline import count_tokens
+from ttl_cache import TTLCache
+
+# =============================
+# Summarizing chat history window
+# =============================
+# RunnableWithMessageHistory puts the whole history into the prompt on every
+# turn, so prompt size and latency grow with the conversation.
+# SummarizingChatHistory keeps the last `max_turns` turns verbatim. Older
+# turns are folded into a running summary, and each update only sends the
+# previous summary plus the turns being dropped. If the summary plus the
+# window still exceed `max_tokens`, more turns are folded in. The newest turn
+# is always kept, even when it alone is over the budget.
+#
+# ChatSessions maps session ids to histories. Each session has its own
+# history and lock, so concurrent users neither share nor wait on one
+# history. Idle sessions expire and the map is size-bounded.
+
+SUMMARY_PROMPT = (
+    "Update the running summary of a conversation with the new lines below. Keep facts, names, decisions and "
+    "open questions; drop small talk. Answer with the updated summary only, in at most {max_words} words.\n\n"
+    "Current summary:\n{summary}\n\nNew lines:\n{lines}"
+)
+
+
+def message_tokens(message: BaseMessage) -> int:
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return count_tokens(content) + 4  # role and message framing
+
+
+def split_turns(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """Group messages into turns, each starting at a human message."""
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+class SummarizingChatHistory(BaseChatMessageHistory):
+    """Last `max_turns` turns verbatim plus an incrementally updated summary, within `max_tokens`."""
+
+    def __init__(self, summarizer, max_turns: int = 4, max_tokens: int = 2000, summary_words: int = 150):
+        self.summarizer = summarizer
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.summary_words = summary_words
+        self.summary = ""
+        self.turns: List[List[BaseMessage]] = []
+        self.summarized_turns = 0
+        self.summary_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        with self._lock:
+            prefix = [SystemMessage(f"Summary of the earlier conversation: {self.summary}")] if self.summary else []
+            return prefix + [message for turn in self.turns for message in turn]
+
+    def _tokens(self) -> int:
+        return count_tokens(self.summary) + sum(message_tokens(m) for turn in self.turns for m in turn)
+
+    def _summarize(self, turns: List[List[BaseMessage]]) -> str:
+        lines = "\n".join(f"{message.type}: {message.content}" for turn in turns for message in turn)
+        response = self.summarizer.invoke(SUMMARY_PROMPT.format(max_words=self.summary_words,
+                                                                summary=self.summary or "(none)", lines=lines))
+        self.summary_calls += 1
+        return getattr(response, "content", response).strip()
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        with self._lock:
+            for turn in split_turns(messages):
+                if self.turns and not isinstance(turn[0], HumanMessage):
+                    self.turns[-1].extend(turn)  # e.g. the AI answer arriving after its question
+                else:
+                    self.turns.append(turn)
+            dropped = []
+            while len(self.turns) > 1 and (len(self.turns) > self.max_turns or self._tokens() > self.max_tokens):
+                dropped.append(self.turns.pop(0))
+            if not dropped:
+                return
+            try:
+                self.summary = self._summarize(dropped)
+            except Exception as exc:
+                # Keep the turns verbatim and retry on the next update rather than losing them
+                print(f"Chat history summary failed ({type(exc).__name__}: {exc}); keeping the turns for now.")
+                self.turns[:0] = dropped
+                return
+            self.summarized_turns += len(dropped)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.summary = ""
+            self.turns = []
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"verbatim_turns": len(self.turns), "summarized_turns": self.summarized_turns,
+                    "summary_calls": self.summary_calls, "prompt_tokens": self._tokens()}
+
+
+class ChatSessions:
+    """session_id -> history map; pass it as RunnableWithMessageHistory's get_session_history."""
+
+    def __init__(self, factory: Callable[[], BaseChatMessageHistory], max_sessions: int = 1000,
+                 idle_ttl: float = 3600.0):
+        self.factory = factory
+        self._sessions = TTLCache(maxsize=max_sessions, ttl=idle_ttl)
+        self._lock = threading.Lock()
+
+    def __call__(self, session_id: str) -> BaseChatMessageHistory:
+        history = self._sessions.get(session_id)
+        if history is None:
+            with self._lock:  # two reruns of a new session must not create two histories
+                history = self._sessions.get(session_id)
+                if history is None:
+                    history = self.factory()
+                self._sessions.set(session_id, history)
+        else:
+            self._sessions.set(session_id, history)  # refreshes the idle timer
+        return history
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -0,0 +1,102 @@
+import time
+from typing import List, Sequence
+
+from langchain_core.documents import Document
+
+from embedding_pipeline import count_tokens
+
+# =============================
+# Context packing
+# =============================
+# Turns the retrieved chunks into the prompt context:
+#   1. chunks of the same listing with consecutive positions are merged into
+#      one passage, dropping the text repeated by the splitter's overlap
+#   2. passages already contained in a selected passage are skipped
+#   3. passages are added in relevance order until the token budget is full
+# Chunks without listing/chunk metadata are kept as standalone passages.
+
+# chunk_overlap of the RecursiveCharacterTextSplitter the RAG scripts index with
+SPLITTER_CHUNK_OVERLAP = 10
+
+
+def _word_boundary(before: str, after: str) -> bool:
+    return not (before.isalnum() and after.isalnum())
+
+
+def _strip_overlap(left: str, right: str, max_overlap: int = SPLITTER_CHUNK_OVERLAP) -> str:
+    """Return `right` without the prefix it repeats from the end of `left`.
+
+    The splitter repeats whole words, at most chunk_overlap characters of them, so only a match that
+    starts and ends on word boundaries is stripped. Neighbours that merely share a letter at the seam
+    ('... TX' / 'Xavier ...') are joined unchanged.
+    """
+    for size in range(min(max_overlap, len(left), len(right)), 0, -1):
+        prefix = right[:size]
+        if (left.endswith(prefix)
+                and (size == len(left) or _word_boundary(left[-size - 1], prefix[0]))
+                and (size == len(right) or _word_boundary(prefix[-1], right[size]))):
+            return right[size:].lstrip()
+    return right
+
+
+def merge_passages(docs: Sequence[Document], chunk_overlap: int = SPLITTER_CHUNK_OVERLAP) -> List[Document]:
+    """Merge adjacent chunks of a listing; passages keep the rank of their best chunk."""
+    groups = {}
+    passages = []
+    for rank, doc in enumerate(docs):
+        listing, position = doc.metadata.get("listing_id"), doc.metadata.get("chunk")
+        if listing is None or position is None:
+            passages.append((rank, doc))
+        else:
+            groups.setdefault(listing, []).append((position, rank, doc))
+
+    for chunks in groups.values():
+        chunks.sort(key=lambda item: item[0])
+        run_start, run_rank, text, last_position = None, None, "", None
+        for position, rank, doc in chunks:
+            if last_position is not None and position == last_position:
+                continue  # the same chunk retrieved twice
+            if last_position is not None and position == last_position + 1:
+                text = f"{text} {_strip_overlap(text, doc.page_content, chunk_overlap)}".strip()
+                run_rank = min(run_rank, rank)
+            else:
+                if run_start is not None:
+                    passages.append((run_rank, Document(page_content=text, metadata=run_start.metadata)))
+                run_start, run_rank, text = doc, rank, doc.page_content
+            last_position = position
+        passages.append((run_rank, Document(page_content=text, metadata=run_start.metadata)))
+
+    return [doc for _, doc in sorted(passages, key=lambda item: item[0])]
+
+
+def pack_context(docs: Sequence[Document], token_budget: int = 1000,
+                 chunk_overlap: int = SPLITTER_CHUNK_OVERLAP) -> str:
+    """Context string of de-duplicated passages that fits in `token_budget` tokens."""
+    selected, used = [], 0
+    for passage in merge_passages(docs, chunk_overlap):
+        text = passage.page_content.strip()
+        if not text or any(text in chosen for chosen in selected):
+            continue
+        tokens = count_tokens(text)
+        if used + tokens > token_budget:
+            continue  # a shorter, less relevant passage may still fit
+        selected.append(text)
+        used += tokens
+    return "\n\n".join(selected)
+
+
+def packing_report(question: str, docs: Sequence[Document], llm, prompt, token_budget: int = 1000) -> dict:
+    """Prompt tokens and time-to-first-token with naive joining vs. packed context."""
+    report = {}
+    contexts = {"joined": "\n\n".join(doc.page_content for doc in docs), "packed": pack_context(docs, token_budget)}
+    for name, context in contexts.items():
+        messages = prompt.invoke({"question": question, "context": context})
+        start = time.perf_counter()
+        for _ in llm.stream(messages):
+            ttft = time.perf_counter() - start
+            break
+        else:
+            ttft = None
+        report[name] = {"prompt_tokens": count_tokens(messages.to_string()),
+                        "context_chars": len(context), "ttft_s": round(ttft, 3) if ttft else None}
+    return report
@@ -0,0 +1,101 @@
+import hashlib
+import sqlite3
+import threading
+from array import array
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+# =============================
+# Persistent embedding cache
+# =============================
+# Wraps any LangChain embeddings object and keeps every vector it has ever
+# produced in a single SQLite file, keyed by (model name, sha256 of the chunk
+# text). Restarting a script that indexes an unchanged job_listings.txt then
+# costs one file read instead of one embedding call per chunk.
+
+DEFAULT_CACHE_PATH = ".embedding_cache.sqlite"
+
+
+class PersistentEmbeddingCache(Embeddings):
+    """Content-addressed, on-disk cache in front of an embeddings provider."""
+
+    def __init__(self, underlying: Embeddings, path: str = DEFAULT_CACHE_PATH,
+                 namespace: Optional[str] = None):
+        self.underlying = underlying
+        # The model name is part of the key so switching models never serves stale vectors
+        self.namespace = namespace or getattr(underlying, "model", None) or type(underlying).__name__
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    def _lookup(self, keys: List[str]) -> dict:
+        found = {}
+        # SQLite limits the number of bound parameters, so look keys up in slices
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            placeholders = ",".join("?" * len(part))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", part
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = array("d", blob).tolist()
+        return found
+
+    def _split_hits(self, texts: List[str]):
+        """Return (keys, cached vectors, {key: text} still to embed)."""
+        keys = [self._key(text) for text in texts]
+        with self._lock:
+            cached = self._lookup(list(set(keys)))
+
+        # Only new or changed chunks go to the provider, each distinct text once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        return keys, cached, missing
+
+    def _store(self, cached: dict, missing: dict, vectors: List[List[float]]):
+        fresh = dict(zip(missing.keys(), vectors))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("d", vector).tobytes()) for key, vector in fresh.items()],
+            )
+            self._conn.commit()
+        cached.update(fresh)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._split_hits(texts)
+        if missing:
+            self._store(cached, missing, self.underlying.embed_documents(list(missing.values())))
+        return [list(cached[key]) for key in keys]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._split_hits(texts)
+        if missing:
+            self._store(cached, missing, await self.underlying.aembed_documents(list(missing.values())))
+        return [list(cached[key]) for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        # Questions are rarely repeated verbatim across restarts, so they are not persisted
+        return self.underlying.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.underlying.aembed_query(text)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,176 @@
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken missing or its encoding file cannot be fetched offline
+    _ENCODING = None
+
+# =============================
+# Concurrent embedding pipeline
+# =============================
+# Embeds chunks in token-budgeted batches with bounded concurrency. When the
+# provider answers 429 all senders pause (honouring Retry-After) and the
+# pipeline halves its concurrency; it grows back one slot at a time after a run of
+# successful batches. Throughput numbers are collected as it goes.
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    # Rough rule of thumb for English text when no tokenizer is available
+    return len(text) // 4 + 1
+
+
+def token_batches(docs: Iterable[Document], max_tokens: int = 8000,
+                  max_items: int = 256) -> Iterator[List[Document]]:
+    """Group documents so each batch stays under both the token and item limits."""
+    batch, batch_tokens = [], 0
+    for doc in docs:
+        tokens = count_tokens(doc.page_content)
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_items):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(doc)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds to wait if `exc` is a rate-limit error, otherwise None."""
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429 and type(exc).__name__ != "RateLimitError":
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class PipelineStats:
+    chunks: int = 0
+    tokens: int = 0
+    batches: int = 0
+    rate_limited: int = 0
+    seconds: float = 0.0
+    final_concurrency: int = 0
+
+    @property
+    def chunks_per_s(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    @property
+    def tokens_per_s(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "chunks_per_s": round(self.chunks_per_s, 1),
+                "tokens_per_s": round(self.tokens_per_s, 1)}
+
+
+class EmbeddingPipeline:
+    """Async, rate-limit-aware batch embedder that feeds a vector store."""
+
+    def __init__(self, embeddings: Embeddings, max_tokens_per_batch: int = 8000,
+                 max_batch_size: int = 256, max_concurrency: int = 4,
+                 max_retries: int = 8, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.embeddings = embeddings
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    async def _acquire(self):
+        while True:
+            # A 429 pauses every sender, not only the batch that received it
+            pause = self._resume_at - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            async with self._slots:
+                await self._slots.wait_for(lambda: self._active < self._limit)
+                if time.monotonic() >= self._resume_at:
+                    self._active += 1
+                    return
+
+    async def _release(self):
+        async with self._slots:
+            self._active -= 1
+            self._slots.notify_all()
+
+    async def _embed_batch(self, texts: List[str], stats: PipelineStats) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            await self._acquire()
+            try:
+                vectors = await self.embeddings.aembed_documents(texts)
+            except Exception as exc:
+                retry_after = _retry_after(exc)
+                if retry_after is None or attempt == self.max_retries:
+                    raise
+                stats.rate_limited += 1
+                # Multiplicative decrease, at most once per burst of 429s from the same window
+                now = time.monotonic()
+                if now - self._last_decrease > max(retry_after, self.base_delay):
+                    self._limit = max(1, self._limit // 2)
+                    self._last_decrease = now
+                self._streak = 0
+            else:
+                self._streak += 1
+                if self._streak >= 4 and self._limit < self.max_concurrency:
+                    self._limit += 1
+                    self._streak = 0
+                return vectors
+            finally:
+                await self._release()
+            if retry_after:
+                delay = retry_after * random.uniform(1.0, 1.5)
+            else:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    async def aindex(self, vector_store, docs: Iterable[Document]) -> PipelineStats:
+        """Embed `docs` and add them to `vector_store` (which must support add_embeddings)."""
+        self._slots = asyncio.Condition()
+        self._active, self._limit, self._streak = 0, self.max_concurrency, 0
+        self._last_decrease, self._resume_at = 0.0, 0.0
+        stats = PipelineStats()
+        # Bounds how many batches are read ahead of the ones being embedded
+        in_flight = asyncio.Semaphore(self.max_concurrency * 2)
+        start = time.perf_counter()
+
+        async def run(batch: List[Document], tokens: int):
+            try:
+                texts = [doc.page_content for doc in batch]
+                vectors = await self._embed_batch(texts, stats)
+                vector_store.add_embeddings(texts, vectors, metadatas=[doc.metadata for doc in batch],
+                                            ids=[doc.id for doc in batch])
+                stats.chunks += len(batch)
+                stats.tokens += tokens
+                stats.batches += 1
+            finally:
+                in_flight.release()
+
+        tasks = []
+        for batch in token_batches(docs, self.max_tokens_per_batch, self.max_batch_size):
+            await in_flight.acquire()
+            tokens = sum(count_tokens(doc.page_content) for doc in batch)
+            tasks.append(asyncio.ensure_future(run(batch, tokens)))
+        await asyncio.gather(*tasks)
+
+        stats.seconds = time.perf_counter() - start
+        stats.final_concurrency = self._limit
+        return stats
+
+    def index(self, vector_store, docs: Iterable[Document]) -> PipelineStats:
+        return asyncio.run(self.aindex(vector_store, docs))
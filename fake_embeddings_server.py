@@ -0,0 +1,89 @@
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =============================
+# Local fake embeddings server
+# =============================
+# Minimal OpenAI-compatible POST /v1/embeddings endpoint for exercising the
+# embedding pipeline offline. Vectors are derived from a hash of the input, so
+# they are deterministic. A token bucket limits requests per second and
+# excess requests get a 429 with Retry-After, like the real API.
+
+
+def fake_vector(item, dim: int):
+    seed = hashlib.sha256(json.dumps(item).encode("utf-8")).digest()
+    return [((seed[i % len(seed)] + i) % 255) / 127.5 - 1.0 for i in range(dim)]
+
+
+def make_server(port: int = 0, dim: int = 256, requests_per_second: float = 20.0,
+                latency: float = 0.05) -> ThreadingHTTPServer:
+    bucket = {"tokens": requests_per_second, "updated": time.monotonic()}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict = None):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                now = time.monotonic()
+                bucket["tokens"] = min(requests_per_second,
+                                       bucket["tokens"] + (now - bucket["updated"]) * requests_per_second)
+                bucket["updated"] = now
+                allowed = bucket["tokens"] >= 1
+                if allowed:
+                    bucket["tokens"] -= 1
+            if not allowed:
+                self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                           {"Retry-After": "0.2"})
+                return
+
+            time.sleep(latency)
+            inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+            data = [{"object": "embedding", "index": i, "embedding": fake_vector(item, dim)}
+                    for i, item in enumerate(inputs)]
+            self._send(200, {"object": "list", "data": data, "model": body.get("model", "fake"),
+                             "usage": {"prompt_tokens": 0, "total_tokens": 0}})
+
+    return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+if __name__ == "__main__":
+    # Run the embedding pipeline against the fake server:
+    #   python fake_embeddings_server.py [listings_file] [requests_per_second]
+    # One chunk per request at 8-way concurrency outruns the default 3 requests/s,
+    # so the run goes through the pipeline's 429 backoff and concurrency reduction.
+    from langchain_openai import OpenAIEmbeddings
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from embedding_pipeline import EmbeddingPipeline
+    from numpy_vector_store import NumpyVectorStore
+    from streaming_ingest import iter_chunks
+
+    requests_per_second = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    server = make_server(requests_per_second=requests_per_second)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    embeddings = OpenAIEmbeddings(model="text-embedding-3-large", api_key="fake",
+                                  base_url=f"http://127.0.0.1:{server.server_port}/v1",
+                                  check_embedding_ctx_length=False, max_retries=0)
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "job_listings.txt"
+    chunks = iter_chunks(path, RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=10))
+    store = NumpyVectorStore(embeddings)
+    stats = EmbeddingPipeline(embeddings, max_batch_size=1, max_concurrency=8).index(store, chunks)
+    print(json.dumps(stats.as_dict(), indent=2))
+    server.shutdown()
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# =============================
+# Local stub for the agent tool APIs
+# =============================
+# Serves the OpenWeather, Google Geocoding / Distance Matrix and MediaWiki
+# endpoints the agent tools call, with deterministic fake data derived from a
+# hash of the inputs. `latency` is added to every response and a
+# `failure_rate` fraction of requests answers 503, so retries, timeouts and
+# caching can be exercised offline:
+#
+#   python fake_tool_server.py --port 8766
+#   OPENWEATHER_BASE_URL=http://127.0.0.1:8766 GOOGLE_MAPS_BASE_URL=http://127.0.0.1:8766 \
+#   WIKIPEDIA_API_URL=http://127.0.0.1:8766/w/api.php python langchain_agent_with_google_maps.py
+
+
+def _number(text: str, low: float, high: float) -> float:
+    seed = int.from_bytes(hashlib.sha256(text.lower().encode("utf-8")).digest()[:8], "big")
+    return low + (seed / 2 ** 64) * (high - low)
+
+
+def _coordinates(address: str):
+    # Addresses are spread around Stockholm so drive times stay plausible
+    return round(59.33 + _number(address + "lat", -0.5, 0.5), 6), round(18.07 + _number(address + "lng", -0.8, 0.8), 6)
+
+
+def make_server(port: int = 0, latency: float = 0.02, failure_rate: float = 0.0, seed: int = 0) -> ThreadingHTTPServer:
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    counts = {}
+
+    def weather(query):
+        city = query["q"][0]
+        return {"name": city, "weather": [{"description": ["clear sky", "light rain", "overcast clouds"][
+            int(_number(city, 0, 3))]}], "main": {"temp": round(_number(city, -5, 30), 1)}}
+
+    def geocode(query):
+        lat, lng = _coordinates(query["address"][0])
+        return {"status": "OK", "results": [{"geometry": {"location": {"lat": lat, "lng": lng}}}]}
+
+    def distance_matrix(query):
+        origins = query["origins"][0].split("|")
+        destinations = query["destinations"][0].split("|")
+        rows = []
+        for origin in origins:
+            elements = []
+            for destination in destinations:
+                (lat1, lng1), (lat2, lng2) = _coordinates(origin), _coordinates(destination)
+                km = (((lat1 - lat2) * 111) ** 2 + ((lng1 - lng2) * 57) ** 2) ** 0.5 * 1.3
+                elements.append({"status": "OK", "distance": {"value": int(km * 1000)},
+                                 "duration": {"value": int(km / 45 * 3600) + 120}})
+            rows.append({"elements": elements})
+        return {"status": "OK", "origin_addresses": origins, "destination_addresses": destinations, "rows": rows}
+
+    def wikipedia(query):
+        title = (query.get("gsrsearch") or query.get("titles"))[0]
+        return {"query": {"pages": {"1": {"pageid": 1, "title": title,
+                                          "extract": f"{title} is a place. It is often visited. It has a history."}}}}
+
+    routes = {"/data/2.5/weather": weather, "/maps/api/geocode/json": geocode,
+              "/maps/api/distancematrix/json": distance_matrix, "/w/api.php": wikipedia}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: dict):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/stats":
+                self._send(200, counts)
+                return
+            if parts.path not in routes:
+                self._send(404, {"error": "not found"})
+                return
+            with lock:
+                counts[parts.path] = counts.get(parts.path, 0) + 1
+                fail = rng.random() < failure_rate
+            time.sleep(latency)
+            if fail:
+                self._send(503, {"error": "unavailable"})
+                return
+            self._send(200, routes[parts.path](parse_qs(parts.query)))
+
+    return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+if __name__ == "__main__":
+    # Exercise the shared HTTP client against a flaky stub:
+    #   python fake_tool_server.py
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stub weather/Maps/Wikipedia APIs for the agent tools.")
+    parser.add_argument("--port", type=int, help="serve until interrupted instead of running the demo")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = make_server(args.port or 0, args.latency, args.failure_rate)
+    if args.port:
+        print(f"Tool API stub on http://127.0.0.1:{args.port}")
+        server.serve_forever()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    from http_client import HTTPClient
+    base = f"http://127.0.0.1:{server.server_port}"
+    client = HTTPClient(per_host_limit=4, base_delay=0.05)
+    cities = ["Stockholm", "Uppsala", "Gothenburg", "Malmo"] * 10
+    start = time.perf_counter()
+    with ThreadPoolExecutor(16) as pool:
+        statuses = list(pool.map(lambda city: client.get(f"{base}/data/2.5/weather", params={"q": city}).status_code,
+                                 cities))
+    print(f"{statuses.count(200)}/{len(statuses)} ok in {time.perf_counter() - start:.2f}s")
+    print(json.dumps(client.stats(), indent=2))
+    server.shutdown()
@@ -1,7 +1,8 @@
 import os
 from langchain_ollama import ChatOllama
+from perf_callbacks import perf_config
 
 llm = ChatOllama(model="gemma:2b")
 question = input("What's your question? ")
-response = llm.invoke(question)
+response = llm.invoke(question, config=perf_config())
 print(response.content)
\ No newline at end of file
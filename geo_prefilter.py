@@ -0,0 +1,95 @@
+import math
+import threading
+from typing import Dict, Optional, Tuple
+
+# =============================
+# Great-circle drive-time pre-filter
+# =============================
+# A car cannot cover the straight-line (haversine) distance between two
+# points faster than at motorway speed. That gives a lower bound on the
+# drive time from geocodes alone. Destinations whose lower bound already
+# exceeds the cutoff are answered locally instead of being sent to the paid
+# Distance Matrix API. The counters record how many API elements and requests
+# were saved, how many geocode requests the filter itself caused (cache
+# misses), the net saving, and how the bound compares with the real drive
+# times of the destinations that were sent (a bound above the actual time is a
+# violation, meaning max_speed_kmh is set too low).
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def parse_coordinates(text: str) -> Optional[Tuple[float, float]]:
+    """'59.33,18.07' -> (59.33, 18.07); None for anything else (e.g. 'Coordinates not found.')."""
+    try:
+        lat, lon = (float(part) for part in text.split(","))
+    except ValueError:
+        return None
+    return lat, lon
+
+
+class DriveTimePrefilter:
+    """Lower-bounds drive times from coordinates and keeps accuracy / calls-saved counters."""
+
+    def __init__(self, cutoff_minutes: float = 60.0, max_speed_kmh: float = 110.0):
+        self.cutoff_minutes = cutoff_minutes
+        self.max_speed_kmh = max_speed_kmh
+        self.checked = 0
+        self.skipped = 0
+        self.requests_saved = 0
+        self.geocode_requests = 0
+        self.compared = 0
+        self.violations = 0
+        self._ratio_sum = 0.0
+        self._lock = threading.Lock()
+
+    def lower_bound_minutes(self, origin: Tuple[float, float], destination: Tuple[float, float]) -> float:
+        return haversine_km(origin, destination) / self.max_speed_kmh * 60
+
+    def split(self, origin: Optional[Tuple[float, float]],
+              destinations: Dict[str, Optional[Tuple[float, float]]]) -> Tuple[Dict[str, Optional[float]], Dict[str, float]]:
+        """({destination: lower bound or None} to query, {destination: lower bound} beyond the cutoff).
+
+        Destinations without coordinates are always queried.
+        """
+        plausible, beyond = {}, {}
+        for name, coordinates in destinations.items():
+            bound = None if origin is None or coordinates is None else self.lower_bound_minutes(origin, coordinates)
+            if bound is not None and bound > self.cutoff_minutes:
+                beyond[name] = round(bound, 1)
+            else:
+                plausible[name] = bound
+        with self._lock:
+            self.checked += len(destinations)
+            self.skipped += len(beyond)
+            self.requests_saved += bool(destinations) and not plausible
+        return plausible, beyond
+
+    def record_geocodes(self, requests: int):
+        """Count geocode lookups made for the filter that were not served from the cache."""
+        with self._lock:
+            self.geocode_requests += requests
+
+    def record(self, bound_minutes: Optional[float], actual_minutes: Optional[float]):
+        """Compare a lower bound with the drive time the API returned for the same destination."""
+        if bound_minutes is None or not actual_minutes:
+            return
+        with self._lock:
+            self.compared += 1
+            self.violations += bound_minutes > actual_minutes
+            self._ratio_sum += bound_minutes / actual_minutes
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"destinations_checked": self.checked, "api_elements_saved": self.skipped,
+                    "distance_matrix_requests_saved": self.requests_saved,
+                    "geocode_requests_added": self.geocode_requests,
+                    "net_requests_saved": self.requests_saved - self.geocode_requests,
+                    "bounds_compared": self.compared,
+                    "bound_violations": self.violations,
+                    "mean_bound_to_actual": round(self._ratio_sum / self.compared, 3) if self.compared else None}
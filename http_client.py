@@ -0,0 +1,128 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# =============================
+# Shared HTTP client for agent tools
+# =============================
+# One requests.Session per process, so the weather, Maps and Wikipedia tools
+# reuse keep-alive connections instead of doing a TCP+TLS handshake per call.
+# Each request gets a (connect, read) timeout. Connection errors, timeouts, 429
+# and 5xx responses are retried with jittered exponential backoff, honouring
+# Retry-After. A semaphore per host caps the number of concurrent requests to
+# one upstream. Latency, error and retry counts are recorded per endpoint
+# (host + path).
+#
+# The API base URLs can be overridden so the tools can be pointed at a local
+# stub such as fake_tool_server.py:
+#   OPENWEATHER_BASE_URL=http://127.0.0.1:8766 GOOGLE_MAPS_BASE_URL=... python langchain_agent.py
+
+OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org").rstrip("/")
+GOOGLE_MAPS_BASE_URL = os.getenv("GOOGLE_MAPS_BASE_URL", "https://maps.googleapis.com").rstrip("/")
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _percentile(ordered, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+class HTTPClient:
+    """Pooled session with timeouts, per-host concurrency limits, retries and latency metrics."""
+
+    def __init__(self, pool_size: int = 16, per_host_limit: int = 4,
+                 timeout: Union[float, Tuple[float, float]] = (3.05, 10.0), max_retries: int = 3,
+                 base_delay: float = 0.25, max_delay: float = 4.0, host_limits: Optional[Dict[str, int]] = None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.per_host_limit = per_host_limit
+        self.host_limits = dict(host_limits or {})
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "job-agent-tools/1.0 (python-requests)"  # Wikipedia requires one
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._metrics: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _slots(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.host_limits.get(host, self.per_host_limit))
+            return self._host_slots[host]
+
+    def _record(self, endpoint: str, seconds: float, error: bool, retries: int):
+        with self._lock:
+            metrics = self._metrics.setdefault(endpoint, {"requests": 0, "errors": 0, "retries": 0,
+                                                          "latencies": deque(maxlen=1024)})
+            metrics["requests"] += 1
+            metrics["errors"] += error
+            metrics["retries"] += retries
+            metrics["latencies"].append(seconds)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        try:
+            return min(self.max_delay, float(retry_after)) * random.uniform(1.0, 1.5)
+        except (TypeError, ValueError):
+            return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures.
+
+        Returns the last response (which may still be a 429/5xx); raises the
+        last requests.RequestException if every attempt failed to connect.
+        """
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            response, error = None, None
+            with self._slots(parts.netloc):
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as exc:
+                    error = exc
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                break
+            if attempt == self.max_retries:
+                break
+            time.sleep(self._backoff(attempt, response))
+        self._record(endpoint, time.perf_counter() - start, response is None or response.status_code >= 400, attempt)
+        if response is None:
+            raise error
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-endpoint request/error/retry counts and latency percentiles in ms."""
+        with self._lock:
+            snapshot = {endpoint: dict(metrics, latencies=sorted(metrics["latencies"]))
+                        for endpoint, metrics in self._metrics.items()}
+        return {endpoint: {"requests": m["requests"], "errors": m["errors"], "retries": m["retries"],
+                           "p50_ms": round(_percentile(m["latencies"], 50) * 1000, 1),
+                           "p95_ms": round(_percentile(m["latencies"], 95) * 1000, 1),
+                           "max_ms": round(max(m["latencies"], default=0.0) * 1000, 1)}
+                for endpoint, m in snapshot.items()}
+
+
+# Shared by every tool in the process
+http_client = HTTPClient(
+    per_host_limit=int(os.getenv("TOOL_HTTP_PER_HOST", "4")),
+    timeout=(3.05, float(os.getenv("TOOL_HTTP_TIMEOUT", "10"))),
+    max_retries=int(os.getenv("TOOL_HTTP_RETRIES", "3")),
+)
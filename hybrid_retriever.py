@@ -0,0 +1,111 @@
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+# =============================
+# Hybrid BM25 + vector retrieval
+# =============================
+# A local inverted index scored with BM25, fused with dense results by
+# reciprocal rank fusion. Exact-term questions ("jobs requiring SQL", "roles
+# at SecureNet") usually have one clear lexical winner. When that happens the
+# lexical hits are returned directly and the query is never embedded.
+
+STOPWORDS = {
+    "a", "an", "and", "any", "are", "at", "be", "can", "do", "does", "for", "from", "have", "i", "in",
+    "is", "it", "job", "jobs", "me", "of", "on", "or", "role", "roles", "show", "that", "the", "there",
+    "to", "what", "which", "with", "who", "you",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in re.findall(r"\w+", text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Inverted index over chunk Documents with Okapi BM25 scoring."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Document], **kwargs) -> "BM25Index":
+        index = cls(**kwargs)
+        index.add_documents(documents)
+        return index
+
+    def add_documents(self, documents: Iterable[Document]):
+        for doc in documents:
+            position = len(self.documents)
+            terms = tokenize(doc.page_content)
+            self.documents.append(doc)
+            self.doc_lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                self.postings[term][position] = count
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        n_docs = len(self.documents)
+        if n_docs == 0:
+            return []
+        average_length = sum(self.doc_lengths) / n_docs
+        scores: Dict[int, float] = defaultdict(float)
+        # Only documents sharing a term with the query are ever touched
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[position] / average_length)
+                scores[position] += idf * tf * (self.k1 + 1) / (tf + norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.documents[position], score) for position, score in best]
+
+
+def reciprocal_rank_fusion(result_lists: Iterable[List[Document]], k: int = 60) -> List[Document]:
+    scores: Dict[str, float] = defaultdict(float)
+    documents: Dict[str, Document] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results):
+            key = doc.id or doc.page_content
+            scores[key] += 1.0 / (k + rank + 1)
+            documents.setdefault(key, doc)
+    return [documents[key] for key in sorted(scores, key=scores.get, reverse=True)]
+
+
+class HybridRetriever:
+    """BM25 first; skip the embedding call when the lexical match is unambiguous."""
+
+    def __init__(self, vector_store: VectorStore, bm25: BM25Index,
+                 min_score: float = 2.0, confidence_ratio: float = 1.5, rrf_k: int = 60):
+        self.vector_store = vector_store
+        self.bm25 = bm25
+        self.min_score = min_score
+        self.confidence_ratio = confidence_ratio
+        self.rrf_k = rrf_k
+        self.lexical_only = 0
+        self.fused = 0
+
+    def _confident(self, lexical: List[Tuple[Document, float]]) -> bool:
+        if not lexical or lexical[0][1] < self.min_score:
+            return False
+        return len(lexical) == 1 or lexical[0][1] >= self.confidence_ratio * lexical[1][1]
+
+    def search(self, query: str, k: int = 4) -> List[Document]:
+        lexical = self.bm25.search(query, k * 2)
+        if self._confident(lexical):
+            self.lexical_only += 1
+            return [doc for doc, _ in lexical[:k]]
+        self.fused += 1
+        dense = self.vector_store.similarity_search(query, k=k * 2)
+        return reciprocal_rank_fusion([[doc for doc, _ in lexical], dense], self.rrf_k)[:k]
+
+    def stats(self) -> dict:
+        return {"lexical_only": self.lexical_only, "fused": self.fused}
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from langchain_community.document_loaders import TextLoader
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# =============================
+# Incremental re-indexing
+# =============================
+# Keeps a vector store in sync with job_listings.txt without rebuilding it.
+# Every listing (one line of the file) is fingerprinted, and its chunks get
+# ids derived from that fingerprint. A sync only embeds chunks of new or
+# edited listings and deletes the chunks of listings that disappeared.
+# The listing -> chunk ids manifest is kept next to the persisted store.
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IncrementalIndexer:
+    """Apply only the listing-level delta of a listings file to a vector store."""
+
+    def __init__(self, vector_store: VectorStore, path: str = "job_listings.txt",
+                 text_splitter: Optional[RecursiveCharacterTextSplitter] = None,
+                 manifest_path: Optional[str] = None):
+        self.vector_store = vector_store
+        self.path = path
+        self.text_splitter = text_splitter or RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=10)
+        self.manifest_path = manifest_path
+        self.manifest: Dict[str, List[str]] = {}
+        if manifest_path and os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self._lock = threading.Lock()
+
+    def _listing_chunks(self) -> Dict[str, List[Document]]:
+        """Load the file and split each listing into chunks with content-derived ids."""
+        listings = {}
+        for doc in TextLoader(self.path).load():
+            for line in doc.page_content.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                listing_id = _fingerprint(line)
+                listing = Document(page_content=line, metadata={**doc.metadata, "listing_id": listing_id})
+                chunks = self.text_splitter.split_documents([listing])
+                for position, chunk in enumerate(chunks):
+                    chunk.id = _fingerprint(f"{listing_id}:{position}:{chunk.page_content}")
+                listings[listing_id] = chunks
+        return listings
+
+    def sync(self) -> Dict[str, int]:
+        """Embed added/changed listings, delete removed ones and return the counts."""
+        with self._lock:
+            current = self._listing_chunks()
+            added = [listing_id for listing_id in current if listing_id not in self.manifest]
+            removed = [listing_id for listing_id in self.manifest if listing_id not in current]
+
+            stale_ids = [chunk_id for listing_id in removed for chunk_id in self.manifest[listing_id]]
+            if stale_ids:
+                self.vector_store.delete(ids=stale_ids)
+
+            new_chunks = [chunk for listing_id in added for chunk in current[listing_id]]
+            if new_chunks:
+                self.vector_store.add_documents(new_chunks, ids=[chunk.id for chunk in new_chunks])
+
+            for listing_id in removed:
+                del self.manifest[listing_id]
+            for listing_id in added:
+                self.manifest[listing_id] = [chunk.id for chunk in current[listing_id]]
+            if added or removed:
+                self._save_manifest()
+
+            return {"added": len(added), "removed": len(removed),
+                    "unchanged": len(current) - len(added), "chunks_embedded": len(new_chunks)}
+
+    def _save_manifest(self):
+        if not self.manifest_path:
+            return
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        with open(f"{self.manifest_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+    def watch(self, interval: float = 2.0, on_sync=None) -> threading.Event:
+        """Poll the file in a background thread and sync whenever it changes.
+
+        Returns an Event; set it to stop watching.
+        """
+        stop = threading.Event()
+
+        def _signature():
+            try:
+                stat = os.stat(self.path)
+                return stat.st_mtime_ns, stat.st_size
+            except FileNotFoundError:
+                return None
+
+        def _run():
+            last = _signature()
+            while not stop.wait(interval):
+                current = _signature()
+                if current is None or current == last:
+                    continue
+                last = current
+                counts = self.sync()
+                if on_sync:
+                    on_sync(counts)
+
+        threading.Thread(target=_run, name="listings-watcher", daemon=True).start()
+        return stop
@@ -0,0 +1,147 @@
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# =============================
+# IVF approximate nearest-neighbour index
+# =============================
+# Inverted-file index over the rows of a NumpyVectorStore matrix. Vectors are
+# clustered with spherical k-means; a query only scores the rows in the
+# `nprobe` clusters whose centroids are closest to it. More probes means
+# better recall and slower queries. The index stores row numbers only, the
+# vectors themselves stay in the store's (possibly memory-mapped) matrix.
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, block: int = 65536) -> np.ndarray:
+    """Nearest centroid for each vector, computed in blocks to bound memory."""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block):
+        labels[start:start + block] = np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+    return labels
+
+
+class IVFIndex:
+    """Inverted-file index with a tunable `nprobe` recall/latency knob."""
+
+    def __init__(self, n_lists: int = 64, nprobe: int = 8, seed: int = 0):
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray, iterations: int = 10, sample_per_list: int = 256):
+        """Fit the coarse centroids on (a sample of) normalised vectors."""
+        rng = np.random.default_rng(self.seed)
+        n_lists = max(1, min(self.n_lists, len(vectors)))
+        sample_size = min(len(vectors), n_lists * sample_per_list)
+        sample = np.asarray(vectors[rng.choice(len(vectors), sample_size, replace=False)], dtype=np.float32)
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = _assign(sample, centroids)
+            for c in range(n_lists):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+                else:
+                    # Re-seed empty clusters so every list stays useful
+                    centroids[c] = sample[rng.integers(len(sample))]
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        self.n_lists = n_lists
+        self.centroids = centroids
+        self.lists = [np.zeros(0, dtype=np.int64) for _ in range(n_lists)]
+
+    def add(self, rows: Sequence[int], vectors: np.ndarray):
+        """Incrementally insert rows; centroids are not retrained."""
+        rows = np.asarray(rows, dtype=np.int64)
+        labels = _assign(np.asarray(vectors, dtype=np.float32), self.centroids)
+        for c in np.unique(labels):
+            self.lists[c] = np.concatenate([self.lists[c], rows[labels == c]])
+
+    def remap(self, keep: Sequence[int]):
+        """Follow a store compaction where only the rows in `keep` survive, renumbered 0..n-1."""
+        keep = np.asarray(keep, dtype=np.int64)
+        new_row = np.full(int(keep.max()) + 1 if len(keep) else 0, -1, dtype=np.int64)
+        new_row[keep] = np.arange(len(keep))
+        for c, rows in enumerate(self.lists):
+            rows = rows[rows < len(new_row)]
+            mapped = new_row[rows]
+            self.lists[c] = mapped[mapped >= 0]
+
+    def search(self, matrix: np.ndarray, query: np.ndarray, k: int, nprobe: Optional[int] = None):
+        """Return (rows, scores) of the approximate top-k rows of `matrix` for a normalised query."""
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        candidates = np.concatenate([self.lists[c] for c in probe])
+        if len(candidates) == 0:
+            return candidates, np.zeros(0, dtype=np.float32)
+        scores = matrix[candidates] @ query
+        if k < len(scores):
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return candidates[top], scores[top]
+
+    def save(self, path: str):
+        sizes = np.array([len(rows) for rows in self.lists], dtype=np.int64)
+        np.savez(path, centroids=self.centroids, sizes=sizes,
+                 rows=np.concatenate(self.lists) if self.lists else np.zeros(0, dtype=np.int64),
+                 nprobe=self.nprobe, seed=self.seed)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        data = np.load(path)
+        index = cls(n_lists=len(data["centroids"]), nprobe=int(data["nprobe"]), seed=int(data["seed"]))
+        index.centroids = data["centroids"]
+        index.lists = list(np.split(data["rows"], np.cumsum(data["sizes"])[:-1]))
+        return index
+
+
+def recall_report(store, query_vectors: np.ndarray, k: int = 4, nprobes: Sequence[int] = (1, 2, 4, 8, 16, 32)):
+    """Compare the store's IVF index against exact search: recall@k and mean latency per nprobe."""
+    queries = np.asarray(query_vectors, dtype=np.float32)
+    queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+    start = time.perf_counter()
+    exact = [set(store._top_rows(q, k)[0].tolist()) for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    report = []
+    for nprobe in nprobes:
+        if nprobe > store.ann_index.n_lists:
+            break
+        start = time.perf_counter()
+        found = [store.ann_index.search(store.matrix, q, k, nprobe)[0] for q in queries]
+        ann_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = np.mean([len(truth.intersection(rows.tolist())) / len(truth) for truth, rows in zip(exact, found)])
+        report.append({"nprobe": nprobe, "recall": round(float(recall), 4),
+                       "ann_ms": round(ann_ms, 3), "exact_ms": round(exact_ms, 3)})
+    return report
+
+
+if __name__ == "__main__":
+    # Recall-vs-exact trade-off on synthetic clustered vectors (no API calls)
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from numpy_vector_store import NumpyVectorStore
+
+    rng = np.random.default_rng(0)
+    n, dim = 100_000, 256
+    centers = rng.normal(size=(200, dim))
+    vectors = centers[rng.integers(len(centers), size=n)] + rng.normal(scale=0.8, size=(n, dim))
+
+    store = NumpyVectorStore(DeterministicFakeEmbedding(size=dim))
+    store.add_embeddings([str(i) for i in range(n)], vectors, ids=[str(i) for i in range(n)])
+    store.build_ann_index(n_lists=256)
+
+    queries = centers[rng.integers(len(centers), size=200)] + rng.normal(scale=0.8, size=(200, dim))
+    print(f"{'nprobe':>6} {'recall@10':>9} {'ann ms':>8} {'exact ms':>8}")
+    for row in recall_report(store, queries, k=10):
+        print(f"{row['nprobe']:>6} {row['recall']:>9} {row['ann_ms']:>8} {row['exact_ms']:>8}")
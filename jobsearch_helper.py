@@ -2,8 +2,12 @@ import os
 
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import OpenAIEmbeddings
-from langchain_core.vectorstores import InMemoryVectorStore
-from langchain_community.document_loaders import TextLoader
+from embedding_cache import PersistentEmbeddingCache
+from numpy_vector_store import DEFAULT_INDEX_PATH, NumpyVectorStore, file_fingerprint
+from streaming_ingest import ingest
+from listing_fields import ListingTable
+from perf_callbacks import perf_config
+from retrieval_service import RetrievalServiceClient
 from langchain.chat_models import init_chat_model
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -13,15 +17,35 @@ from typing_extensions import List, TypedDict
 
 llm = init_chat_model("gpt-4o-mini", model_provider="openai")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-embeddings = OpenAIEmbeddings(model="text-embedding-3-large")
+# Serve unchanged chunks from the on-disk cache instead of re-embedding them on every run.
+# ingest() has no 429 backoff of its own (unlike EmbeddingPipeline), so this client keeps
+# the openai client's default retries.
+embeddings = PersistentEmbeddingCache(OpenAIEmbeddings(model="text-embedding-3-large"))
 
-vector_store = InMemoryVectorStore(embeddings)
-docs = TextLoader("job_listings.txt").load()
 text_splitter = RecursiveCharacterTextSplitter(chunk_size=200,chunk_overlap=10)
-all_splits=text_splitter.split_documents(docs)
 
-# Index chunks
-_ = vector_store.add_documents(documents=all_splits)
+# Stream the listings into packed skill/company columns; each listing's chunks are re-read and split as they are indexed
+listing_table = ListingTable.from_file("job_listings.txt")
+if os.getenv("RETRIEVAL_SERVICE_URL"):
+    # A running retrieval_service.py already holds the index; only the chunk counts are needed here
+    vector_store = RetrievalServiceClient(os.getenv("RETRIEVAL_SERVICE_URL"))
+    listing_table.count_chunks(text_splitter)
+else:
+    # While job_listings.txt is unchanged the saved index is memory-mapped instead of rebuilt;
+    # the same per-listing chunks as langchain_simple_rag.py, so both scripts share one index
+    vector_store = NumpyVectorStore.load_or_build(
+        os.getenv("RAG_INDEX_PATH", DEFAULT_INDEX_PATH), embeddings,
+        file_fingerprint("job_listings.txt", "listing chunks", 200, 10, "text-embedding-3-large"),
+        lambda store: ingest(store, listing_table.chunk_documents(text_splitter)))
+    if not listing_table.chunk_counts:
+        listing_table.count_chunks(text_splitter)  # loaded, so chunk_documents() never ran
+
+    # Optional IVF index for large listing feeds; exact search is faster for a small file
+    if os.getenv("RAG_ANN_INDEX"):
+        vector_store.build_ann_index(nprobe=int(os.getenv("RAG_ANN_NPROBE", "8")))
+    # Optional int8/binary codes for candidate search, rescored at full precision
+    if os.getenv("RAG_QUANTIZATION"):
+        vector_store.build_quantized_index(mode=os.getenv("RAG_QUANTIZATION"))
 
 # Define prompt for question-answering
 prompt = PromptTemplate.from_template(
@@ -43,7 +67,16 @@ class State(TypedDict):
 
 # Define application steps
 def retrieve(state: State):
-    retrieved_docs = vector_store.similarity_search(state["question"])
+    # Skills/companies named in the question ("requires Python") narrow the candidates first
+    rows = listing_table.filter_rows(state["question"])
+    if rows is not None and len(rows) == 0:
+        # No listing has all the named skills ("Python and Java"); let vector search find the nearest ones
+        rows = None
+    if rows is not None and len(rows) <= 4:
+        # Few enough matches to send the whole listings; no vector scoring needed
+        return {"context": listing_table.documents(rows)}
+    candidate_ids = listing_table.chunk_ids(rows) if rows is not None else None
+    retrieved_docs = vector_store.similarity_search(state["question"], ids=candidate_ids)
     #This print statement is only for debugging
     #print(retrieved_docs)
     return {"context": retrieved_docs}
@@ -59,9 +92,10 @@ graph_builder = StateGraph(State).add_sequence([retrieve, generate])
 graph_builder.add_edge(START, "retrieve")
 graph = graph_builder.compile()
 
-user_input = input("enter your question")
-response = graph.invoke({"question": user_input})
-print(response["answer"])
+if __name__ == "__main__":
+    user_input = input("enter your question")
+    response = graph.invoke({"question": user_input}, config=perf_config())
+    print(response["answer"])
 
 
 '''
@@ -1,21 +1,32 @@
 import os
 from langchain_openai import OpenAIEmbeddings
-from langchain_community.document_loaders import TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_chroma import Chroma
+from incremental_indexer import IncrementalIndexer
+from perf_callbacks import perf_config
+from retrieval_service import RetrievalServiceClient
 
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm = OpenAIEmbeddings(api_key=OPENAI_API_KEY)
 
-document = TextLoader("job_listings.txt").load()
+CHROMA_DIR = "chroma_job_listings"
 text_splitter = RecursiveCharacterTextSplitter(chunk_size=200,chunk_overlap=10)
-chunks=text_splitter.split_documents(document)
-db=Chroma.from_documents(chunks,llm)
-retriever = db.as_retriever()
+
+if os.getenv("RETRIEVAL_SERVICE_URL"):
+    # Query the index held by a running retrieval_service.py instead of opening Chroma
+    retriever = RetrievalServiceClient(os.getenv("RETRIEVAL_SERVICE_URL")).as_retriever()
+else:
+    db = Chroma(collection_name="job_listings", embedding_function=llm, persist_directory=CHROMA_DIR)
+
+    # Only listings added or edited since the last run are embedded; removed ones are deleted
+    indexer = IncrementalIndexer(db, "job_listings.txt", text_splitter,
+                                 manifest_path=os.path.join(CHROMA_DIR, "listings_manifest.json"))
+    print("Index sync:", indexer.sync())
+    retriever = db.as_retriever()
 
 text = input("Enter the text:")
-docs = retriever.invoke(text)
+docs = retriever.invoke(text, config=perf_config())
 
 for doc in docs:
     print(doc.page_content)
\ No newline at end of file
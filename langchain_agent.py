@@ -1,55 +1,31 @@
 import os
-import requests
-import wikipedia
 from dotenv import load_dotenv
-from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
-from langchain.agents import create_react_agent, AgentExecutor
-from langchain import hub
+from agent_startup import Lazy, pull_prompt
+from agent_tools import get_weather, wiki_summary
+from perf_callbacks import perf_config
+from tool_cache import tool_cache
 
 # Load API keys
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
 
-# ===== Tools =====
-@tool
-def get_weather(city: str) -> str:
-    """Get current weather for a city."""
-
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={OPENWEATHER_API_KEY}&units=metric"
-    print("url to weather" )
-    print(url)
-    response = requests.get(url)
-    if response.status_code != 200:
-        return f"Weather data not available for {city}."
-    data = response.json()
-    print("printing weather response data")
-    print (data)
-    desc = data["weather"][0]["description"]
-    temp = data["main"]["temp"]
-    return f"{city}: {desc}, {temp}°C"
-
-@tool
-def wiki_summary(place: str) -> str:
-    """Get a 3-line Wikipedia summary for a place."""
-    try:
-        return wikipedia.summary(place, sentences=3)
-    except Exception:
-        return f"No Wikipedia info found for {place}."
+# ===== Tools list (the tools are shared with the other agent scripts, see agent_tools.py) =====
+tools = [get_weather, wiki_summary]
 
-# ===== LLM =====
-llm = ChatOpenAI(model="gpt-4", temperature=0)
+# ===== Create the agent and executor =====
+def build_agent_executor():
+    from langchain_openai import ChatOpenAI
+    from langchain.agents import create_react_agent, AgentExecutor
 
-# ===== Tools list =====
-tools = [get_weather, wiki_summary]
+    llm = ChatOpenAI(model="gpt-4", temperature=0)
+    # LangChain's default ReAct prompt, cached locally after the first hub pull
+    prompt = pull_prompt("hwchase17/react")  # contains {tools}, {tool_names}, {agent_scratchpad}
+    agent = create_react_agent(llm, tools, prompt)
+    return AgentExecutor(agent=agent, tools=tools, verbose=True)
 
-# ===== Use LangChain's default ReAct prompt from the hub =====
-prompt = hub.pull("hwchase17/react")  # contains {tools}, {tool_names}, {agent_scratchpad}
 
-# ===== Create the agent and executor =====
-agent = create_react_agent(llm, tools, prompt)
-agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
+# Built on first invoke, so startup only costs the imports above
+agent_executor = Lazy(build_agent_executor)
 
 # ===== Run =====
 if __name__ == "__main__":
@@ -59,5 +35,6 @@ if __name__ == "__main__":
         "Based on that weather and your own knowledge of the city's attractions, pick the top two attractions "
         "to visit today. Then call the 'wiki_summary' tool for each to give a 3-line summary."
     )
-    result = agent_executor.invoke({"input": task})
+    result = agent_executor.invoke({"input": task}, config=perf_config())
     print("\nResult:\n", result["output"])
+    print("Tool cache:", tool_cache.stats())
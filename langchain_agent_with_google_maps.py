@@ -1,125 +1,47 @@
 import os
-import requests
-import wikipedia
 from dotenv import load_dotenv
-from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
-from langchain.agents import create_react_agent, AgentExecutor
-from langchain import hub
-from urllib.parse import quote_plus
+from agent_startup import Lazy, pull_prompt
+from agent_tools import (MAX_DRIVE_MINUTES, drive_time_prefilter, get_coordinates, get_drive_times, get_weather,
+                         wiki_summary)
+from perf_callbacks import perf_config
+from tool_cache import tool_cache
 
 # =============================
 # Load API keys from .env file
 # =============================
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
-GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")  # Google Maps API key
+
+# The weather, geocoding, drive-time and Wikipedia tools live in agent_tools.py,
+# shared with the other agent scripts
 
 # =============================
-# Tools Section
+# LangChain Agent Setup
 # =============================
 
-@tool
-def get_weather(city: str) -> str:
-    """
-    Get current weather for a city from the OpenWeather API.
-    Returns a string like: 'Paris: sunny, 25°C'
-    """
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={quote_plus(city)}&appid={OPENWEATHER_API_KEY}&units=metric"
-    print("Weather API URL:", url)
-    response = requests.get(url)
-    if response.status_code != 200:
-        return f"Weather data not available for {city}."
-    data = response.json()
-    desc = data["weather"][0]["description"]
-    temp = data["main"]["temp"]
-    return f"{city}: {desc}, {temp}°C"
-
-
-@tool
-def get_coordinates(address: str) -> str:
-    """
-    Get latitude and longitude for an address using Google Maps Geocoding API.
-    Returns a string 'lat,lon' or 'Coordinates not found.'
-    """
-    encoded_address = quote_plus(address)
-    url = f"https://maps.googleapis.com/maps/api/geocode/json?address={encoded_address}&key={GOOGLE_MAPS_API_KEY}"
-    print("Geocode API URL:", url)
-    r = requests.get(url)
-    if r.status_code != 200:
-        return "Coordinates not found."
-    result = r.json()
-    if not result.get("results"):
-        return "Coordinates not found."
-    location = result["results"][0]["geometry"]["location"]
-    return f"{location['lat']},{location['lng']}"
-
-
-@tool
-def get_drive_time_minutes(addresses: str) -> str:
-    """
-    Get driving time in minutes between two addresses using Google Maps Distance Matrix API.
-    Expects input: "start_address|dest_address"
-    Returns a string with the drive time in minutes (e.g., '45.2') or error message.
-    """
-    try:
-        start_address, dest_address = [a.strip() for a in addresses.split("|")]
-    except Exception:
-        return "Invalid input format, expected 'start_address|dest_address'."
-
-    start_encoded = quote_plus(start_address)
-    dest_encoded = quote_plus(dest_address)
-
-    url = (
-        f"https://maps.googleapis.com/maps/api/distancematrix/json?"
-        f"origins={start_encoded}&destinations={dest_encoded}&mode=driving&key={GOOGLE_MAPS_API_KEY}"
-    )
-    print("Distance Matrix API URL:", url)
-
-    r = requests.get(url)
-    if r.status_code != 200:
-        return "Error fetching distance data."
-    data = r.json()
-
-    try:
-        duration_seconds = data["rows"][0]["elements"][0]["duration"]["value"]
-    except (IndexError, KeyError):
-        return "Driving time data not found."
-
-    minutes = duration_seconds / 60
-    return f"{minutes:.1f}"
-
+# Register all tools
+tools = [get_weather, get_coordinates, get_drive_times, wiki_summary]
 
-@tool
-def wiki_summary(place: str) -> str:
-    """
-    Get a 3-line Wikipedia summary for a place.
-    """
-    try:
-        return wikipedia.summary(place, sentences=3)
-    except Exception:
-        return f"No Wikipedia info found for {place}."
 
+def build_agent_executor():
+    from langchain_openai import ChatOpenAI
+    from langchain.agents import create_react_agent, AgentExecutor
 
-# =============================
-# LangChain Agent Setup
-# =============================
+    # Create LLM
+    llm = ChatOpenAI(model="gpt-4", temperature=0)
 
-# Create LLM
-llm = ChatOpenAI(model="gpt-4", temperature=0)
+    # Default ReAct prompt from LangChain hub, cached locally after the first pull
+    prompt = pull_prompt("hwchase17/react")
 
-# Register all tools
-tools = [get_weather, get_coordinates, get_drive_time_minutes, wiki_summary]
+    # Create the ReAct-style agent with tools
+    agent = create_react_agent(llm, tools, prompt)
 
-# Use default ReAct prompt from LangChain hub
-prompt = hub.pull("hwchase17/react")
+    # Create the executor that will run the agent
+    return AgentExecutor(agent=agent, tools=tools, verbose=True)
 
-# Create the ReAct-style agent with tools
-agent = create_react_agent(llm, tools, prompt)
 
-# Create the executor that will run the agent
-agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
+# The LLM and executor are built on first invoke, after the inputs are read
+agent_executor = Lazy(build_agent_executor)
 
 # =============================
 # Main Program
@@ -134,15 +56,18 @@ if __name__ == "__main__":
     task = (
         f"Step 1: Call 'get_weather' for {city_name}.\n"
         f"Step 2: Based on the weather and your knowledge of {city_name}, suggest 5 attractions in the city that would be good to visit today.\n"
-        f"Step 3: For each attraction, call 'get_drive_time_minutes' with input formatted as '{home_address}, {city_name}|<attraction>, {city_name}'.\n"
-        "Step 4: Keep only those with a driving time of 60 minutes or less.\n"
-        "Step 5: If fewer than 2 attractions qualify, suggest additional attractions and check again until you have at least 2 that meet the requirement.\n"
+        f"Step 3: Call 'get_drive_times' once for all 5 attractions, with input formatted as '{home_address}, {city_name}|<attraction 1>, {city_name}|<attraction 2>, {city_name}|...'.\n"
+        f"Step 4: Keep only those with a driving time of {MAX_DRIVE_MINUTES} minutes or less.\n"
+        "Step 5: If fewer than 2 attractions qualify, suggest additional attractions and check them all with one more 'get_drive_times' call, until you have at least 2 that meet the requirement.\n"
         "Step 6: Once you have 2 qualifying attractions, call 'wiki_summary' for each (3-line summary).\n"
         "Step 7: Return the weather, the two chosen attractions, their travel times, and the Wikipedia summaries."
     )
 
     # Run the agent
-    result = agent_executor.invoke({"input": task})
+    result = agent_executor.invoke({"input": task}, config=perf_config())
 
     # Print final result
     print("\nFinal Result:\n", result["output"])
+    print("Tool cache:", tool_cache.stats())
+    if drive_time_prefilter is not None:
+        print("Drive-time pre-filter:", drive_time_prefilter.stats())
@@ -1,102 +1,51 @@
 import os
-import requests
-import wikipedia
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
-from langchain.agents import create_react_agent, AgentExecutor
-from langchain import hub
+from agent_startup import pull_prompt
+from agent_tools import MAX_DRIVE_MINUTES, get_drive_times, get_weather, wiki_summary
+from parallel_tool_agent import ParallelToolAgent
+from perf_callbacks import perf_config, perf_handler
+from streamlit_helpers import chat_model
 
 # =============================
 # Load API keys from .env file
 # =============================
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
-GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
 # =============================
-# Tools Section
+# LangChain Agent Setup
 # =============================
 
-@tool
-def get_weather(city: str) -> str:
-    """
-    Get current weather for a city from OpenWeather API.
-    """
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={OPENWEATHER_API_KEY}&units=metric"
-    response = requests.get(url)
-    if response.status_code != 200:
-        return f"Weather data not available for {city}."
-    data = response.json()
-    desc = data["weather"][0]["description"]
-    temp = data["main"]["temp"]
-    return f"{city}: {desc}, {temp}°C"
-
-
-@tool
-def get_drive_time_minutes(addresses: str) -> str:
-    """
-    Get driving time in minutes between two addresses using Google Maps Distance Matrix API.
-    Expects input: "start_address|dest_address"
-    Returns driving time in minutes as string or error message.
-    """
-    try:
-        start_address, dest_address = [a.strip() for a in addresses.split("|")]
-    except Exception:
-        return "Invalid input format, expected 'start_address|dest_address'."
-
-    # Prepare URL
-    url = (
-        f"https://maps.googleapis.com/maps/api/distancematrix/json"
-        f"?origins={requests.utils.quote(start_address)}"
-        f"&destinations={requests.utils.quote(dest_address)}"
-        f"&mode=driving"
-        f"&key={GOOGLE_MAPS_API_KEY}"
-    )
-
-    print("Google Maps Distance Matrix URL:", url)  # debug print
-
-    r = requests.get(url)
-    if r.status_code != 200:
-        return "Error getting driving time from Google Maps API."
-
-    data = r.json()
-    if data["status"] != "OK":
-        return f"Error in API response: {data['status']}"
-
-    try:
-        element = data["rows"][0]["elements"][0]
-        if element["status"] != "OK":
-            return f"Route not found: {element['status']}"
-        seconds = element["duration"]["value"]
-        minutes = seconds / 60
-        return f"{minutes:.1f}"
-    except Exception:
-        return "Unexpected API response format....."
-
-
-@tool
-def wiki_summary(place: str) -> str:
-    """
-    Get a 3-line Wikipedia summary for a place.
-    """
-    try:
-        return wikipedia.summary(place, sentences=3)
-    except Exception:
-        return f"No Wikipedia info found for {place}."
+# The tools are shared with the other agent scripts (agent_tools.py)
+tools = [get_weather, get_drive_times, wiki_summary]
 
 
-# =============================
-# LangChain Agent Setup
-# =============================
+# Cached resources: built on first use, then shared by every rerun and session of this server
+@st.cache_resource
+def build_agent_executor():
+    from langchain.agents import create_react_agent, AgentExecutor
+
+    llm = chat_model("gpt-4", temperature=0)
+    prompt = pull_prompt("hwchase17/react")  # cached locally after the first hub pull
+    agent = create_react_agent(llm, tools, prompt)
+    return AgentExecutor(agent=agent, tools=tools, verbose=True)
 
-llm = ChatOpenAI(model="gpt-4", temperature=0)
-tools = [get_weather, get_drive_time_minutes, wiki_summary]
-prompt = hub.pull("hwchase17/react")
-agent = create_react_agent(llm, tools, prompt)
-agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
+
+@st.cache_resource
+def build_tool_calling_agent(max_concurrency: int):
+    # Native tool calling: all independent calls of one turn (e.g. both wiki_summary
+    # lookups) run concurrently. gpt-4o emits parallel tool calls; the original gpt-4 doesn't.
+    llm = chat_model("gpt-4o", temperature=0)
+    return ParallelToolAgent(llm, tools, max_concurrency=max_concurrency, verbose=True)
+
+
+def show_turn(turn: int, tool_calls, results):
+    """Render one tool-calling turn as soon as its tools return."""
+    with st.status(f"Turn {turn}: {len(tool_calls)} tool call(s)", state="complete"):
+        for call, result in zip(tool_calls, results):
+            st.markdown(f"**{call['name']}** `{call['args']}`")
+            st.text(result.content)
 
 
 # =============================
@@ -105,6 +54,10 @@ agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
 
 st.title("Stockholm Attractions Planner 🌤️🏛️")
 
+agent_mode = st.sidebar.radio("Agent mode", ["Parallel tool calling", "ReAct"])
+max_concurrency = st.sidebar.slider("Max concurrent tool calls", min_value=1, max_value=8, value=4,
+                                    disabled=agent_mode == "ReAct")
+
 home_address = st.text_input("Enter your home address:")
 city_name = st.text_input("Enter the city name:")
 
@@ -115,14 +68,26 @@ if st.button("Find Attractions"):
         task = (
             f"Step 1: Call 'get_weather' for {city_name}.\n"
             f"Step 2: Based on the weather and your knowledge of {city_name}, suggest 5 attractions in the city that would be good to visit today.\n"
-            f"Step 3: For each attraction, call 'get_drive_time_minutes' with input formatted as '{home_address}, {city_name}|<attraction>, {city_name}'.\n"
-            "Step 4: Keep only those with a driving time of 60 minutes or less.\n"
-            "Step 5: If fewer than 2 attractions qualify, suggest additional attractions and check again until you have at least 2 that meet the requirement.\n"
+            f"Step 3: Call 'get_drive_times' once for all 5 attractions, with input formatted as '{home_address}, {city_name}|<attraction 1>, {city_name}|<attraction 2>, {city_name}|...'.\n"
+            f"Step 4: Keep only those with a driving time of {MAX_DRIVE_MINUTES} minutes or less.\n"
+            "Step 5: If fewer than 2 attractions qualify, suggest additional attractions and check them all with one more 'get_drive_times' call, until you have at least 2 that meet the requirement.\n"
             "Step 6: Once you have 2 qualifying attractions, call 'wiki_summary' for each (3-line summary).\n"
             "Step 7: Return the weather, the two chosen attractions, their travel times, and the Wikipedia summaries."
         )
 
         with st.spinner("Finding attractions..."):
-            result = agent_executor.invoke({"input": task})
+            # Intermediate steps are shown live while the agent works
+            if agent_mode == "ReAct":
+                from langchain_community.callbacks.streamlit import StreamlitCallbackHandler
+                steps = StreamlitCallbackHandler(st.container(), expand_new_thoughts=False)
+                result = build_agent_executor().invoke({"input": task}, config=perf_config(callbacks=[steps]))
+            else:
+                result = build_tool_calling_agent(max_concurrency).invoke({"input": task}, config=perf_config(),
+                                                                          on_step=show_turn)
             st.subheader("Results:")
             st.write(result["output"])
+            if "llm_turns" in result:
+                st.caption(f"{result['llm_turns']} LLM turns, {len(result['intermediate_steps'])} tool calls")
+
+with st.sidebar.expander("Performance"):
+    st.json(perf_handler.to_dict())
@@ -1,41 +1,86 @@
 import os
 from langchain.chat_models import init_chat_model
 from langchain_openai import OpenAIEmbeddings
-from langchain_core.vectorstores import InMemoryVectorStore
+from embedding_cache import PersistentEmbeddingCache
+from numpy_vector_store import DEFAULT_INDEX_PATH, NumpyVectorStore, file_fingerprint
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from typing_extensions import List, TypedDict
-from langchain_community.document_loaders import TextLoader
+from listing_fields import ListingTable
+from embedding_pipeline import EmbeddingPipeline
+from hybrid_retriever import BM25Index, HybridRetriever
+from perf_callbacks import perf_config
+from retrieval_service import RetrievalServiceClient
 from langgraph.graph import MessagesState, StateGraph
 from langchain_core.tools import tool
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import RemoveMessage, SystemMessage, ToolMessage
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import END
 from langgraph.prebuilt import ToolNode, tools_condition
-from langgraph.checkpoint.memory import MemorySaver
+from sqlite_checkpointer import DEFAULT_CHECKPOINT_PATH, CompactingSqliteSaver
 
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm = init_chat_model("gpt-4o-mini", model_provider="openai")
 
+# Question embeddings; the openai client's own retries cover the occasional 429
 embeddings = OpenAIEmbeddings(model="text-embedding-3-large")
-vector_store = InMemoryVectorStore(embeddings)
 
-vector_store = InMemoryVectorStore(embeddings)
-docs = TextLoader("job_listings.txt").load()
-text_splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=10)
-all_splits = text_splitter.split_documents(docs)
-
-# Index chunks
-_ = vector_store.add_documents(documents=all_splits)
+if os.getenv("RETRIEVAL_SERVICE_URL"):
+    # A running retrieval_service.py does the same hybrid search server-side
+    hybrid_retriever = RetrievalServiceClient(os.getenv("RETRIEVAL_SERVICE_URL"), mode="hybrid")
+else:
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=10)
+    # Per-listing chunks, exactly as retrieval_service.py indexes them, so both modes
+    # return the same documents and metadata
+    listing_table = ListingTable.from_file("job_listings.txt")
+
+    def build_index(store):
+        # Index chunks: token-budgeted batches embedded concurrently, backing off on 429s.
+        # The pipeline does the 429 backoff itself, so its client must not retry internally;
+        # unchanged chunks are served from the on-disk cache instead of being re-embedded.
+        index_embeddings = PersistentEmbeddingCache(OpenAIEmbeddings(model="text-embedding-3-large", max_retries=0))
+        pipeline = EmbeddingPipeline(index_embeddings, max_concurrency=4)
+        index_stats = pipeline.index(store, listing_table.chunk_documents(text_splitter))
+        if os.getenv("RAG_VERBOSE"):
+            print("Indexed:", index_stats.as_dict())
+
+    # Shared with langchain_simple_rag.py / jobsearch_helper.py; memory-mapped while the file is unchanged
+    vector_store = NumpyVectorStore.load_or_build(
+        os.getenv("RAG_INDEX_PATH", DEFAULT_INDEX_PATH), embeddings,
+        file_fingerprint("job_listings.txt", "listing chunks", 200, 10, "text-embedding-3-large"), build_index)
+
+    # Exact-term questions are answered from the BM25 index without embedding the query
+    bm25_index = BM25Index.from_documents(vector_store.get_by_ids(vector_store.ids))
+    hybrid_retriever = HybridRetriever(vector_store, bm25_index)
 
 graph_builder = StateGraph(MessagesState)
 
+# Only the latest messages are kept in the state (and so in each checkpoint) and sent to the
+# model; per-turn work stays flat as the conversation grows
+MAX_HISTORY_MESSAGES = 20
+CONSUMED_TOOL_CONTENT = "[retrieved context used in the answer below]"
+
+
+def recent_messages(messages, limit=MAX_HISTORY_MESSAGES):
+    """The last `limit` messages, never starting with a tool result cut off from its tool call."""
+    window = messages[-limit:]
+    while window and window[0].type == "tool":
+        window = window[1:]
+    return window
+
+
+def trim_history(messages, new_messages):
+    """RemoveMessages for what falls out of the window once `new_messages` are appended."""
+    kept = {message.id for message in recent_messages(list(messages) + list(new_messages))}
+    return [RemoveMessage(id=message.id) for message in messages if message.id not in kept]
+
+
 '''Tool that is to be passed to LLM'''
 @tool(response_format="content_and_artifact")
 def retrieve(query: str):
     """Retrieve information related to a query."""
-    retrieved_docs = vector_store.similarity_search(query, k=2)
+    retrieved_docs = hybrid_retriever.search(query, k=2)
     serialized = "\n\n".join(
         (f"Source: {doc.metadata}\nContent: {doc.page_content}")
         for doc in retrieved_docs
@@ -49,9 +94,9 @@ def retrieve(query: str):
 def query_or_respond(state: MessagesState):
     """Generate tool call for retrieval or respond."""
     llm_with_tools = llm.bind_tools([retrieve])
-    response = llm_with_tools.invoke(state["messages"])
-    # MessagesState appends messages to state instead of overwriting
-    return {"messages": [response]}
+    response = llm_with_tools.invoke(recent_messages(state["messages"]))
+    # MessagesState appends messages to state instead of overwriting; older ones are removed
+    return {"messages": trim_history(state["messages"], [response]) + [response]}
 
 
 # Step 2: Execute the retrieval.
@@ -82,7 +127,7 @@ def generate(state: MessagesState):
     )
     conversation_messages = [
         message
-        for message in state["messages"]
+        for message in recent_messages(state["messages"])
         if message.type in ("human", "system")
         or (message.type == "ai" and not message.tool_calls)
     ]
@@ -90,7 +135,14 @@ def generate(state: MessagesState):
 
     # Run
     response = llm.invoke(prompt)
-    return {"messages": [response]}
+    # The retrieved chunks are consumed now: replace the tool messages (same id, so the
+    # tool-call pairing stays valid) with a stub, keeping checkpoints and later prompts small
+    pruned = [ToolMessage(CONSUMED_TOOL_CONTENT, id=message.id, tool_call_id=message.tool_call_id,
+                          name=message.name)
+              for message in tool_messages]
+    removed = trim_history(state["messages"], [response])
+    removed_ids = {message.id for message in removed}
+    return {"messages": removed + [message for message in pruned if message.id not in removed_ids] + [response]}
 
 graph_builder.add_node(query_or_respond)
 graph_builder.add_node(tools)
@@ -106,11 +158,12 @@ graph_builder.add_edge("tools", "generate")
 graph_builder.add_edge("generate", END)
 
 
-memory = MemorySaver()
+# Conversations survive restarts; each thread keeps only its latest checkpoints
+memory = CompactingSqliteSaver(os.getenv("RAG_CHECKPOINT_PATH", DEFAULT_CHECKPOINT_PATH), keep_last=5)
 graph = graph_builder.compile(checkpointer=memory)
 
-# Specify an ID for the thread
-config = {"configurable": {"thread_id": "abc123"}}
+# Specify an ID for the thread; RAG_THREAD_ID resumes (or starts) another conversation
+config = perf_config({"configurable": {"thread_id": os.getenv("RAG_THREAD_ID", "abc123")}})
 
 #compiling  without memeory
 #graph = graph_builder.compile()
@@ -123,6 +176,8 @@ while(input_message := input("enter your question")):
     ):
         step["messages"][-1].pretty_print()
 
+print("Checkpoints:", memory.stats())
+
 
 '''
 input_message = "is there a data scientist role?"
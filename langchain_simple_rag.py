@@ -2,8 +2,14 @@ import os
 
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import OpenAIEmbeddings
-from langchain_core.vectorstores import InMemoryVectorStore
-from langchain_community.document_loaders import TextLoader
+from embedding_cache import PersistentEmbeddingCache
+from numpy_vector_store import DEFAULT_INDEX_PATH, NumpyVectorStore, file_fingerprint
+from listing_fields import ListingTable
+from embedding_pipeline import EmbeddingPipeline
+from rag_cache import AnswerCache, QueryEmbeddingCache
+from context_packing import pack_context, packing_report
+from perf_callbacks import perf_config
+from retrieval_service import RetrievalServiceClient
 from langchain.chat_models import init_chat_model
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -12,15 +18,47 @@ from typing_extensions import List, TypedDict
 
 llm = init_chat_model("gpt-4o-mini", model_provider="openai")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Question embeddings; the openai client's own retries cover the occasional 429
 embeddings = OpenAIEmbeddings(model="text-embedding-3-large")
 
-vector_store = InMemoryVectorStore(embeddings)
-docs = TextLoader("job_listings.txt").load()
 text_splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=10)
-all_splits = text_splitter.split_documents(docs)
 
-# Index chunks
-_ = vector_store.add_documents(documents=all_splits)
+if os.getenv("RETRIEVAL_SERVICE_URL"):
+    # A running retrieval_service.py holds the index and batches query embeddings across clients
+    vector_store = RetrievalServiceClient(os.getenv("RETRIEVAL_SERVICE_URL"))
+    embeddings = vector_store.embeddings
+else:
+    listing_table = ListingTable.from_file("job_listings.txt")
+
+    def build_index(store):
+        # Index chunks: token-budgeted batches embedded concurrently, backing off on 429s.
+        # Chunks are split per listing so the packing step can merge neighbours again.
+        # The pipeline does the 429 backoff itself, so its client must not retry internally;
+        # unchanged chunks are served from the on-disk cache instead of being re-embedded.
+        index_embeddings = PersistentEmbeddingCache(OpenAIEmbeddings(model="text-embedding-3-large", max_retries=0))
+        pipeline = EmbeddingPipeline(index_embeddings, max_concurrency=4)
+        index_stats = pipeline.index(store, listing_table.chunk_documents(text_splitter))
+        if os.getenv("RAG_VERBOSE"):
+            print("Indexed:", index_stats.as_dict())
+
+    # While job_listings.txt is unchanged the saved index is memory-mapped instead of rebuilt
+    vector_store = NumpyVectorStore.load_or_build(
+        os.getenv("RAG_INDEX_PATH", DEFAULT_INDEX_PATH), embeddings,
+        file_fingerprint("job_listings.txt", "listing chunks", 200, 10, "text-embedding-3-large"), build_index)
+
+    # Optional IVF index for large listing feeds; exact search is faster for a small file
+    if os.getenv("RAG_ANN_INDEX"):
+        vector_store.build_ann_index(nprobe=int(os.getenv("RAG_ANN_NPROBE", "8")))
+    # Optional int8/binary codes for candidate search, rescored at full precision
+    if os.getenv("RAG_QUANTIZATION"):
+        vector_store.build_quantized_index(mode=os.getenv("RAG_QUANTIZATION"))
+
+# Repeated questions skip the query embedding and, if the same chunks come back, the LLM call
+query_embeddings = QueryEmbeddingCache(embeddings, maxsize=1024, ttl=3600)
+answer_cache = AnswerCache(maxsize=512, ttl=3600, similarity_threshold=0.95)
+
+# Token budget for the retrieved context in the generate prompt
+CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKENS", "1000"))
 
 # Define prompt for question-answering
 prompt = PromptTemplate.from_template(
@@ -37,33 +75,53 @@ Helpful Answer:"""
 # Define state for application
 class State(TypedDict):
     question: str
+    query_vector: List[float]
     context: List[Document]
+    packed_context: str
     answer: str
 
 
 # Define application steps
 def retrieve(state: State):
-    retrieved_docs = vector_store.similarity_search(state["question"])
+    query_vector = query_embeddings.embed_query(state["question"])
+    retrieved_docs = vector_store.similarity_search_by_vector(query_vector)
     # This print statement is only for debugging
     # print(retrieved_docs)
-    return {"context": retrieved_docs}
+    return {"query_vector": query_vector, "context": retrieved_docs}
+
+
+def pack(state: State):
+    # Merge neighbouring chunks, drop overlap duplicates and stay within the token budget
+    return {"packed_context": pack_context(state["context"], CONTEXT_TOKEN_BUDGET)}
 
 
 def generate(state: State):
-    docs_content = "\n\n".join(doc.page_content for doc in state["context"])
-    messages = prompt.invoke({"question": state["question"], "context": docs_content})
+    chunk_ids = [doc.id for doc in state["context"]]
+    # Reuse retrieve's vector; embedding again would count a cache hit for every question
+    query_vector = state["query_vector"]
+    cached = answer_cache.get(state["question"], chunk_ids, query_vector, index_version=vector_store.version)
+    if cached is not None:
+        return {"answer": cached}
+
+    messages = prompt.invoke({"question": state["question"], "context": state["packed_context"]})
     response = llm.invoke(messages)
+    answer_cache.set(state["question"], chunk_ids, response.content, query_vector, index_version=vector_store.version)
     return {"answer": response.content}
 
 
 # Compile application and test
-graph_builder = StateGraph(State).add_sequence([retrieve, generate])
+graph_builder = StateGraph(State).add_sequence([retrieve, pack, generate])
 graph_builder.add_edge(START, "retrieve")
 graph = graph_builder.compile()
 
-user_input = input("enter your question")
-response = graph.invoke({"question": user_input})
-print(response["answer"])
+if __name__ == "__main__":
+    user_input = input("enter your question")
+    response = graph.invoke({"question": user_input}, config=perf_config())
+    print(response["answer"])
+    print("Query embedding cache:", query_embeddings.stats())
+    print("Answer cache:", answer_cache.stats())
+    if os.getenv("RAG_PACKING_REPORT"):
+        print(packing_report(user_input, response["context"], llm, prompt, CONTEXT_TOKEN_BUDGET))
 
 
 
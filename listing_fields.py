@@ -0,0 +1,182 @@
+import re
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_text_splitters import TextSplitter
+
+from streaming_ingest import iter_lines
+
+# =============================
+# Structured listing fields
+# =============================
+# Every line of job_listings.txt has the shape
+#   "N. Title at Company - duties... Requires skills."
+# ListingTable streams the file once (streaming_ingest.iter_lines) and keeps
+# only packed per-listing columns (byte offset, company code) plus a packed
+# bitmap of listings per skill and per company. The text, title and skills of
+# a listing are parsed again from the file when its documents or chunks are
+# built, so memory grows by a few bytes per listing, not by its text. A question
+# such as "which jobs require Python and SQL?" becomes an AND of two bitmaps,
+# which narrows (or replaces) the vector search over the chunks. If the
+# question says "or", the skills are OR-ed instead ("Python or R"). The
+# companies named are always OR-ed, then AND-ed with the skills. There is
+# no grouping or negation: "or" anywhere applies to all the skills named.
+
+LISTING_PATTERN = re.compile(
+    r"^\s*(?P<number>\d+)\.\s+(?P<title>.+?)\s+at\s+(?P<company>[^-]+?)\s+-\s+(?P<duties>.*?)"
+    r"(?:\s*Requires\s+(?P<requires>.*?))?\.?\s*$"
+)
+SKILL_QUALIFIERS = re.compile(
+    r"^(?:a |an |the |strong |excellent |proficiency (?:in|with) |expertise (?:in|with) |"
+    r"experience (?:in|with) |knowledge of |familiarity with )+"
+)
+
+
+def parse_listing(line: str) -> dict:
+    """number (None if the line does not match), title, company and skills of one listing line."""
+    match = LISTING_PATTERN.match(line)
+    fields = match.groupdict() if match else {}
+    return {"number": int(fields["number"]) if match else None, "title": (fields.get("title") or "").strip(),
+            "company": (fields.get("company") or "").strip(), "skills": extract_skills(fields.get("requires"))}
+
+
+def extract_skills(requires: Optional[str]) -> List[str]:
+    """'proficiency in Java, Python, and SQL' -> ['java', 'python', 'sql']"""
+    if not requires:
+        return []
+    skills = []
+    for part in re.split(r",\s*(?:and\s+)?|\s+and\s+", requires.lower().rstrip(".")):
+        part = SKILL_QUALIFIERS.sub("", part.strip())
+        part = re.sub(r"\s+skills?$", "", part).strip()
+        if part:
+            skills.append(part)
+    return skills
+
+
+class ListingTable:
+    """Packed columns of a listings file plus skill/company -> listing bitmaps; the text stays in the file."""
+
+    def __init__(self, source: str = "job_listings.txt", encoding: str = "utf-8"):
+        self.source = source
+        self.encoding = encoding
+        # Per-listing columns are packed C arrays; company names are stored once each
+        self.offsets = array("q")
+        self.company_codes = array("i")
+        self.companies: List[str] = []
+        self.chunk_counts = array("i")
+        self._company_code: Dict[str, int] = {}
+        self._skill_rows: Dict[str, array] = {}
+        self._skill_bitmaps: Dict[str, np.ndarray] = {}
+        self._company_bitmaps: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def from_file(cls, path: str, encoding: str = "utf-8") -> "ListingTable":
+        table = cls(source=path, encoding=encoding)
+        for offset, line in iter_lines(path, encoding):
+            table.add(line, offset)
+        table.build_index()
+        return table
+
+    def add(self, line: str, offset: int):
+        """Index one listing line found at byte `offset` of the source file."""
+        row = len(self.offsets)
+        fields = parse_listing(line)
+        company = fields["company"]
+        if company not in self._company_code:
+            self._company_code[company] = len(self.companies)
+            self.companies.append(company)
+
+        self.offsets.append(offset)
+        self.company_codes.append(self._company_code[company])
+        for skill in fields["skills"]:
+            self._skill_rows.setdefault(skill, array("i")).append(row)
+
+    def _bitmap(self, rows: Sequence[int]) -> np.ndarray:
+        mask = np.zeros(len(self), dtype=bool)
+        mask[list(rows)] = True
+        return np.packbits(mask)
+
+    def build_index(self):
+        """(Re)build the packed bitmaps after adding listings."""
+        codes = np.array(self.company_codes, dtype=np.int32)
+        self._skill_bitmaps = {skill: self._bitmap(rows) for skill, rows in self._skill_rows.items()}
+        self._company_bitmaps = {code: self._bitmap(np.flatnonzero(codes == code))
+                                 for code in range(len(self.companies)) if self.companies[code]}
+
+    # ----- Filtering -----
+
+    def filter_rows(self, question: str) -> Optional[np.ndarray]:
+        """Rows matching the skills and companies named in the question, or None if it names none.
+
+        Skills are AND-ed, or OR-ed when the question contains "or"; a listing has one company, so the
+        companies named are OR-ed. The result may be empty.
+        """
+        text = f" {question.lower()} "
+        skill_bitmaps = [bitmap for skill, bitmap in self._skill_bitmaps.items()
+                         if re.search(rf"(?<!\w){re.escape(skill)}(?!\w)", text)]
+        company_bitmaps = [bitmap for code, bitmap in self._company_bitmaps.items()
+                           if re.search(rf"(?<!\w){re.escape(self.companies[code].lower())}(?!\w)", text)]
+        skill_op = np.bitwise_or if re.search(r"\bor\b", text) else np.bitwise_and
+        combined = None
+        for bitmaps, op in ((skill_bitmaps, skill_op), (company_bitmaps, np.bitwise_or)):
+            if not bitmaps:
+                continue
+            group = bitmaps[0]
+            for bitmap in bitmaps[1:]:
+                group = op(group, bitmap)
+            combined = group if combined is None else np.bitwise_and(combined, group)
+        if combined is None:
+            return None
+        return np.flatnonzero(np.unpackbits(combined, count=len(self)))
+
+    # ----- Documents -----
+
+    def listing_id(self, row: int) -> str:
+        return f"listing-{row}"
+
+    def metadata(self, row: int, line: str) -> dict:
+        fields = parse_listing(line)
+        return {"source": self.source, "listing_id": self.listing_id(row),
+                "number": fields["number"] if fields["number"] is not None else row + 1,
+                "title": fields["title"], "company": fields["company"], "skills": fields["skills"]}
+
+    def lines(self) -> Iterator[str]:
+        """Stream the listing lines again, in row order."""
+        for _, line in iter_lines(self.source, self.encoding):
+            yield line
+
+    def documents(self, rows: Sequence[int]) -> List[Document]:
+        """Whole listings as Documents, for when the filter alone is selective enough; reads just those lines."""
+        documents = []
+        with open(self.source, "rb") as f:
+            for row in rows:
+                f.seek(self.offsets[row])
+                line = f.readline().decode(self.encoding).strip()
+                documents.append(Document(id=self.listing_id(row), page_content=line,
+                                          metadata=self.metadata(row, line)))
+        return documents
+
+    def chunk_documents(self, text_splitter: TextSplitter) -> Iterator[Document]:
+        """Split each listing separately so every chunk carries its listing's fields; streams the file."""
+        self.chunk_counts = array("i")
+        for row, line in enumerate(self.lines()):
+            texts = text_splitter.split_text(line)
+            self.chunk_counts.append(len(texts))
+            metadata = self.metadata(row, line)
+            for position, text in enumerate(texts):
+                yield Document(id=f"{self.listing_id(row)}:{position}", page_content=text,
+                               metadata={**metadata, "chunk": position})
+
+    def count_chunks(self, text_splitter: TextSplitter):
+        """Fill chunk_counts without keeping the chunks, for when the index lives elsewhere."""
+        self.chunk_counts = array("i", (len(text_splitter.split_text(line)) for line in self.lines()))
+
+    def chunk_ids(self, rows: Sequence[int]) -> List[str]:
+        """Ids of the chunks chunk_documents() produced for the given rows."""
+        return [f"{self.listing_id(row)}:{position}" for row in rows
+                for position in range(self.chunk_counts[row])]
@@ -0,0 +1,290 @@
+import hashlib
+import json
+import os
+import uuid
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from ivf_index import IVFIndex
+from quantized_index import QuantizedIndex
+
+# =============================
+# NumPy-backed vector store
+# =============================
+# Drop-in replacement for InMemoryVectorStore. All vectors live in one
+# contiguous float32 matrix (L2-normalised, so a dot product is the cosine
+# similarity) and the texts / metadata / ids live in a small side table.
+# save() writes "<path>.npy" + "<path>.json"; load() memory-maps the matrix,
+# so startup is a file map and several processes share the same pages.
+# load_or_build() reuses a saved store only while its source fingerprint
+# (listings file + chunking/model settings) is unchanged.
+# build_ann_index() adds an optional IVF index for large corpora, and
+# build_quantized_index() int8/binary codes that are searched first and
+# rescored at full precision.
+
+DEFAULT_INDEX_PATH = ".listings_index"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def file_fingerprint(path: str, *settings: Any) -> str:
+    """sha256 of a source file plus the settings it was indexed with."""
+    digest = hashlib.sha256(repr(settings).encode("utf-8"))
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class NumpyVectorStore(VectorStore):
+    """Vector store holding every embedding in a single float32 matrix."""
+
+    def __init__(self, embedding: Embeddings):
+        self.embedding = embedding
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[dict] = []
+        self._row_of = {}
+        self.ann_index: Optional[IVFIndex] = None
+        self.quantized_index: Optional[QuantizedIndex] = None
+        # Bumped on every write so caches built on search results can tell they are stale
+        self.version = 0
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ----- Writing -----
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        vectors = self.embedding.embed_documents(texts)
+        return self.add_embeddings(texts, vectors, metadatas=metadatas, ids=ids)
+
+    async def aadd_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                         ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        vectors = await self.embedding.aembed_documents(texts)
+        return self.add_embeddings(texts, vectors, metadatas=metadatas, ids=ids)
+
+    def add_embeddings(self, texts: Sequence[str], vectors: Sequence[Sequence[float]],
+                       metadatas: Optional[Sequence[dict]] = None,
+                       ids: Optional[Sequence[Optional[str]]] = None) -> List[str]:
+        """Add pre-computed vectors. Existing ids are overwritten in place."""
+        if not texts:
+            return []
+        metadatas = list(metadatas) if metadatas else [{} for _ in texts]
+        ids = [i or str(uuid.uuid4()) for i in ids] if ids else [str(uuid.uuid4()) for _ in texts]
+        vectors = _normalize(vectors)
+        self.version += 1
+
+        if len(self.ids) == 0:
+            self.matrix = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+
+        # An id repeated within the batch keeps its last occurrence
+        last_position = {doc_id: position for position, doc_id in enumerate(ids)}
+        new_rows = []
+        for position in sorted(last_position.values()):
+            doc_id = ids[position]
+            row = self._row_of.get(doc_id)
+            if row is None:
+                new_rows.append(position)
+                continue
+            if not self.matrix.flags.writeable:
+                self.matrix = np.array(self.matrix)
+            self.matrix[row] = vectors[position]
+            if self.quantized_index is not None:
+                self.quantized_index.codes[row] = self.quantized_index._encode(vectors[position:position + 1])[0]
+            self.texts[row] = texts[position]
+            self.metadatas[row] = metadatas[position]
+
+        if new_rows:
+            # One concatenate per batch; a memory-mapped matrix becomes a private copy here
+            self.matrix = np.concatenate([self.matrix, vectors[new_rows]])
+            first_row = len(self.ids)
+            for position in new_rows:
+                self._row_of[ids[position]] = len(self.ids)
+                self.ids.append(ids[position])
+                self.texts.append(texts[position])
+                self.metadatas.append(metadatas[position])
+            if self.ann_index is not None:
+                self.ann_index.add(range(first_row, len(self.ids)), vectors[new_rows])
+            if self.quantized_index is not None:
+                self.quantized_index.add(vectors[new_rows])
+        return list(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if ids is None:
+            return False
+        drop = {self._row_of[i] for i in ids if i in self._row_of}
+        if not drop:
+            return False
+        keep = [row for row in range(len(self.ids)) if row not in drop]
+        self.version += 1
+        self.matrix = self.matrix[keep]
+        self.ids = [self.ids[row] for row in keep]
+        self.texts = [self.texts[row] for row in keep]
+        self.metadatas = [self.metadatas[row] for row in keep]
+        self._row_of = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        if self.ann_index is not None:
+            self.ann_index.remap(keep)
+        if self.quantized_index is not None:
+            self.quantized_index.remap(keep)
+        return True
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        return [self._document(self._row_of[i]) for i in ids if i in self._row_of]
+
+    def build_ann_index(self, n_lists: Optional[int] = None, nprobe: int = 8, seed: int = 0) -> IVFIndex:
+        """Train an IVF index over the current rows; later adds are inserted incrementally."""
+        # Roughly sqrt(N) lists keeps both the centroid scan and each list short
+        n_lists = n_lists or max(1, int(np.sqrt(len(self.ids))))
+        index = IVFIndex(n_lists=n_lists, nprobe=nprobe, seed=seed)
+        index.train(self.matrix)
+        index.add(range(len(self.ids)), self.matrix)
+        self.ann_index = index
+        return index
+
+    def build_quantized_index(self, mode: str = "int8", rescore_factor: int = 4) -> QuantizedIndex:
+        """Encode the current rows as int8 or binary codes; later adds are encoded as they arrive."""
+        index = QuantizedIndex(mode=mode, rescore_factor=rescore_factor)
+        index.fit(self.matrix)
+        self.quantized_index = index
+        return index
+
+    # ----- Searching -----
+
+    def _document(self, row: int) -> Document:
+        return Document(id=self.ids[row], page_content=self.texts[row], metadata=self.metadatas[row])
+
+    def _top_rows(self, query: np.ndarray, k: int, rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        scores = self.matrix @ query if rows is None else self.matrix[rows] @ query
+        if k < len(scores):
+            # argpartition finds the k best in linear time; only those k get sorted
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return (top if rows is None else rows[top]), scores[top]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4,
+        filter: Optional[Callable[[Document], bool]] = None, **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        if len(self.ids) == 0:
+            return []
+        query = _normalize(embedding)
+        if kwargs.get("ids") is not None:
+            # Score only a pre-filtered candidate set, e.g. listings matching a skill filter
+            rows = np.array([self._row_of[i] for i in kwargs["ids"] if i in self._row_of], dtype=np.int64)
+            if len(rows) == 0:
+                return []
+            rows, scores = self._top_rows(query, k, rows)
+            return [(self._document(int(r)), float(s)) for r, s in zip(rows, scores)]
+        if filter is None and self.ann_index is not None and kwargs.get("exact") is not True:
+            rows, scores = self.ann_index.search(self.matrix, query, k, kwargs.get("nprobe"))
+            return [(self._document(int(r)), float(s)) for r, s in zip(rows, scores)]
+        if filter is None and self.quantized_index is not None and kwargs.get("exact") is not True:
+            rows, scores = self.quantized_index.search(self.matrix, query, k, kwargs.get("rescore_factor"))
+            return [(self._document(int(r)), float(s)) for r, s in zip(rows, scores)]
+        if filter is None:
+            rows, scores = self._top_rows(query, k)
+            return [(self._document(int(r)), float(s)) for r, s in zip(rows, scores)]
+
+        rows, scores = self._top_rows(query, len(self.ids))
+        results = []
+        for row, score in zip(rows, scores):
+            doc = self._document(int(row))
+            if filter(doc):
+                results.append((doc, float(score)))
+                if len(results) == k:
+                    break
+        return results
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        embedding = await self.embedding.aembed_query(query)
+        return self.similarity_search_by_vector(embedding, k, **kwargs)
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Scores are cosine similarities in [-1, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    # ----- Persistence -----
+
+    def save(self, path: str, fingerprint: Optional[str] = None):
+        """Write "<path>.npy" and "<path>.json", replacing any previous files atomically."""
+        with open(f"{path}.npy.tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(self.matrix, dtype=np.float32))
+        with open(f"{path}.json.tmp", "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "texts": self.texts, "metadatas": self.metadatas,
+                       "fingerprint": fingerprint}, f)
+        # Readers that already mapped the old file keep their pages until they reload
+        os.replace(f"{path}.npy.tmp", f"{path}.npy")
+        os.replace(f"{path}.json.tmp", f"{path}.json")
+        if self.ann_index is not None:
+            self.ann_index.save(f"{path}.ivf.npz")
+        elif os.path.exists(f"{path}.ivf.npz"):
+            os.remove(f"{path}.ivf.npz")
+        if self.quantized_index is not None:
+            self.quantized_index.save(f"{path}.codes.npz")
+        elif os.path.exists(f"{path}.codes.npz"):
+            os.remove(f"{path}.codes.npz")
+
+    @classmethod
+    def load(cls, path: str, embedding: Embeddings, mmap: bool = True) -> "NumpyVectorStore":
+        store = cls(embedding)
+        store.matrix = np.load(f"{path}.npy", mmap_mode="r" if mmap else None)
+        with open(f"{path}.json", encoding="utf-8") as f:
+            table = json.load(f)
+        store.ids = table["ids"]
+        store.texts = table["texts"]
+        store.metadatas = table["metadatas"]
+        store._row_of = {doc_id: row for row, doc_id in enumerate(store.ids)}
+        if os.path.exists(f"{path}.ivf.npz"):
+            store.ann_index = IVFIndex.load(f"{path}.ivf.npz")
+        if os.path.exists(f"{path}.codes.npz"):
+            store.quantized_index = QuantizedIndex.load(f"{path}.codes.npz")
+        return store
+
+    @classmethod
+    def load_or_build(cls, path: str, embedding: Embeddings, fingerprint: str,
+                      build: Callable[["NumpyVectorStore"], Any]) -> "NumpyVectorStore":
+        """Memory-map the store saved at `path` if it was built from `fingerprint`; else build and save it."""
+        if os.path.exists(f"{path}.npy") and os.path.exists(f"{path}.json"):
+            with open(f"{path}.json", encoding="utf-8") as f:
+                if json.load(f).get("fingerprint") == fingerprint:
+                    return cls.load(path, embedding)
+        store = cls(embedding)
+        build(store)
+        store.save(path, fingerprint=fingerprint)
+        return store
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings,
+                   metadatas: Optional[List[dict]] = None, **kwargs: Any) -> "NumpyVectorStore":
+        store = cls(embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=kwargs.get("ids"))
+        return store
@@ -1,8 +1,9 @@
 import os
 from langchain_openai import ChatOpenAI
+from perf_callbacks import perf_config
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 question = input("What's your question? ")
-response = llm.invoke(question)
+response = llm.invoke(question, config=perf_config())
 print(response.content)
\ No newline at end of file
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import BaseTool
+
+# =============================
+# Parallel tool-calling agent
+# =============================
+# create_react_agent parses one Action per LLM turn from text, so N
+# independent lookups (two wiki_summary calls, say) cost N model round trips.
+# ParallelToolAgent uses the model's native tool calling instead. Every tool
+# call from one turn is run at the same time on a thread pool, capped at
+# `max_concurrency`, and the results go back to the model in the order the
+# calls were made, so runs are reproducible.
+# invoke({"input": ...}) returns {"output": ...} like AgentExecutor; an
+# optional on_step(turn, tool_calls, results) hook sees each turn as it finishes.
+
+DEFAULT_SYSTEM_PROMPT = (
+    "You are a helpful assistant that uses the provided tools. "
+    "When several tool calls do not depend on each other, request them all in the same turn."
+)
+
+
+class ParallelToolAgent:
+    """Tool-calling agent loop that executes each turn's tool calls concurrently."""
+
+    def __init__(self, llm, tools: Sequence[BaseTool], system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+                 max_concurrency: int = 4, max_iterations: int = 10, verbose: bool = False):
+        self.llm = llm.bind_tools(list(tools))
+        self.tools = {tool.name: tool for tool in tools}
+        self.system_prompt = system_prompt
+        self.max_concurrency = max_concurrency
+        self.max_iterations = max_iterations
+        self.verbose = verbose
+
+    def _run_tool(self, tool_call: dict, config: Optional[dict] = None) -> ToolMessage:
+        tool = self.tools.get(tool_call["name"])
+        if tool is None:
+            return ToolMessage(f"Unknown tool {tool_call['name']!r}.", tool_call_id=tool_call["id"], status="error")
+        try:
+            return tool.invoke(tool_call, config=config)
+        except Exception as exc:
+            return ToolMessage(f"{type(exc).__name__}: {exc}", tool_call_id=tool_call["id"], status="error")
+
+    def run_tool_calls(self, tool_calls: List[dict], config: Optional[dict] = None) -> List[ToolMessage]:
+        """Run the calls concurrently; results come back in call order."""
+        if len(tool_calls) == 1:
+            return [self._run_tool(tool_calls[0], config)]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(tool_calls))) as pool:
+            return list(pool.map(lambda tool_call: self._run_tool(tool_call, config), tool_calls))
+
+    def invoke(self, inputs: dict, config: Optional[dict] = None,
+               on_step: Optional[Callable[[int, List[dict], List[ToolMessage]], None]] = None) -> dict:
+        messages: List[BaseMessage] = [SystemMessage(self.system_prompt), HumanMessage(inputs["input"])]
+        steps = []
+        for turn in range(1, self.max_iterations + 1):
+            response: AIMessage = self.llm.invoke(messages, config=config)
+            messages.append(response)
+            if not response.tool_calls:
+                return {"input": inputs["input"], "output": response.content, "intermediate_steps": steps,
+                        "llm_turns": turn}
+            if self.verbose:
+                print(f"Turn {turn}: " + ", ".join(f"{call['name']}({call['args']})" for call in response.tool_calls))
+            results = self.run_tool_calls(response.tool_calls, config)
+            messages.extend(results)
+            if on_step is not None:
+                on_step(turn, response.tool_calls, results)
+            steps.extend(zip(response.tool_calls, (result.content for result in results)))
+        return {"input": inputs["input"], "output": "Agent stopped due to iteration limit.",
+                "intermediate_steps": steps, "llm_turns": self.max_iterations}
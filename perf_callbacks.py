@@ -0,0 +1,266 @@
+import atexit
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# =============================
+# Performance callback handler
+# =============================
+# Attach PerfCallbackHandler through `callbacks=[...]` (or perf_config()) and
+# it records, for every run:
+#   - wall time of each LLM call, tool call, retriever call, LangGraph node
+#     and top-level run
+#   - time to first token (streamed LLM calls only)
+#   - prompt / completion tokens per model
+#   - ReAct iterations per AgentExecutor run
+# Timings go into fixed-bucket histograms, which can be exported as JSON or
+# as Prometheus text. The scripts share the module-level `perf_handler`; with
+# PERF_METRICS=path.json (or path.prom, or - for stderr) it is written out
+# when the process exits.
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+ITERATION_BUCKETS = (1, 2, 3, 5, 8, 13, 21)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float] = SECONDS_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty or beyond the last bucket)."""
+        if not self.count:
+            return None
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= q * self.count:
+                return bound
+        return None
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "sum": round(self.sum, 6),
+                "mean": round(self.sum / self.count, 6) if self.count else None,
+                "min": self.min, "max": self.max, "p50_le": self.quantile(0.5), "p95_le": self.quantile(0.95),
+                "buckets": {str(bound): count for bound, count in zip(self.buckets + ("+Inf",), self.counts)}}
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _model_name(serialized: Optional[dict], metadata: Optional[dict], kwargs: dict) -> str:
+    serialized = serialized or {}
+    return ((metadata or {}).get("ls_model_name") or serialized.get("kwargs", {}).get("model_name")
+            or serialized.get("kwargs", {}).get("model") or kwargs.get("name")
+            or (serialized.get("id") or ["llm"])[-1])
+
+
+class PerfCallbackHandler(BaseCallbackHandler):
+    """Collects step timings, TTFT, token usage and ReAct iterations into histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[UUID, Tuple[str, str, float]] = {}
+        self._first_token: Dict[UUID, bool] = {}
+        self._agent_actions: Dict[UUID, int] = {}
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+        self.ttft: Dict[str, Histogram] = {}
+        self.tokens: Dict[Tuple[str, str], int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.react_iterations = Histogram(ITERATION_BUCKETS)
+
+    # ----- bookkeeping -----
+
+    def _start(self, run_id: UUID, kind: str, name: str):
+        with self._lock:
+            self._started[run_id] = (kind, name, time.perf_counter())
+
+    def _end(self, run_id: UUID, error: bool = False):
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            self._first_token.pop(run_id, None)
+            if started is None:
+                return
+            kind, name, start = started
+            self.durations.setdefault((kind, name), Histogram()).observe(time.perf_counter() - start)
+            if error:
+                self.errors[(kind, name)] = self.errors.get((kind, name), 0) + 1
+
+    # ----- LLMs -----
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._start(run_id, "llm", _model_name(serialized, metadata, kwargs))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, tags=None, metadata=None,
+                            **kwargs):
+        self._start(run_id, "llm", _model_name(serialized, metadata, kwargs))
+
+    def on_llm_new_token(self, token, *, chunk=None, run_id, parent_run_id=None, tags=None, **kwargs):
+        with self._lock:
+            started = self._started.get(run_id)
+            if started is None or self._first_token.get(run_id):
+                return
+            self._first_token[run_id] = True
+            self.ttft.setdefault(started[1], Histogram()).observe(time.perf_counter() - started[2])
+
+    def on_llm_end(self, response, *, run_id, parent_run_id=None, tags=None, **kwargs):
+        with self._lock:
+            started = self._started.get(run_id)
+        model = started[1] if started else "llm"
+        prompt_tokens = completion_tokens = 0
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if metadata:
+                    prompt_tokens += metadata.get("input_tokens", 0)
+                    completion_tokens += metadata.get("output_tokens", 0)
+        if not (prompt_tokens or completion_tokens):
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+        with self._lock:
+            self.tokens[(model, "prompt")] = self.tokens.get((model, "prompt"), 0) + prompt_tokens
+            self.tokens[(model, "completion")] = self.tokens.get((model, "completion"), 0) + completion_tokens
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id, parent_run_id=None, tags=None, **kwargs):
+        self._end(run_id, error=True)
+
+    # ----- tools and retrievers -----
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, tags=None, metadata=None,
+                      inputs=None, **kwargs):
+        self._start(run_id, "tool", (serialized or {}).get("name") or kwargs.get("name") or "tool")
+
+    def on_tool_end(self, output, *, run_id, parent_run_id=None, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end(run_id, error=True)
+
+    def on_retriever_start(self, serialized, query, *, run_id, parent_run_id=None, tags=None, metadata=None,
+                           **kwargs):
+        self._start(run_id, "retriever", kwargs.get("name") or (serialized or {}).get("name") or "retriever")
+
+    def on_retriever_end(self, documents, *, run_id, parent_run_id=None, **kwargs):
+        self._end(run_id)
+
+    def on_retriever_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end(run_id, error=True)
+
+    # ----- chains, graph nodes and agents -----
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None,
+                       **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        if parent_run_id is None:
+            self._start(run_id, "run", name)
+        elif (metadata or {}).get("langgraph_node") == name:
+            self._start(run_id, "node", name)
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end(run_id, error=True)
+
+    def on_agent_action(self, action, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            self._agent_actions[run_id] = self._agent_actions.get(run_id, 0) + 1
+
+    def on_agent_finish(self, finish, *, run_id, parent_run_id=None, **kwargs):
+        # One ReAct iteration per tool action, plus the turn that produced the final answer
+        with self._lock:
+            self.react_iterations.observe(self._agent_actions.pop(run_id, 0) + 1)
+
+    # ----- export -----
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "steps": {f"{kind}:{name}": dict(histogram.as_dict(), errors=self.errors.get((kind, name), 0))
+                          for (kind, name), histogram in sorted(self.durations.items())},
+                "ttft": {model: histogram.as_dict() for model, histogram in sorted(self.ttft.items())},
+                "tokens": {f"{model}:{kind}": count for (model, kind), count in sorted(self.tokens.items())},
+                "react_iterations": self.react_iterations.as_dict(),
+            }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "langchain") -> str:
+        lines = []
+
+        def histogram(metric: str, help_text: str, series):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} histogram")
+            for labels, hist in series:
+                base = ",".join(f'{key}="{_label(value)}"' for key, value in labels)
+                sep = "," if base else ""
+                cumulative = 0
+                for bound, count in zip(hist.buckets + ("+Inf",), hist.counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_{metric}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+                lines.append(f"{prefix}_{metric}_sum{{{base}}} {hist.sum}")
+                lines.append(f"{prefix}_{metric}_count{{{base}}} {hist.count}")
+
+        with self._lock:
+            histogram("step_duration_seconds", "Wall time of LLM, tool, retriever, graph node and top-level runs.",
+                      [((("kind", kind), ("name", name)), hist) for (kind, name), hist in sorted(self.durations.items())])
+            histogram("time_to_first_token_seconds", "Time to the first streamed token of an LLM call.",
+                      [((("model", model),), hist) for model, hist in sorted(self.ttft.items())])
+            histogram("react_iterations", "ReAct iterations per agent run.", [((), self.react_iterations)])
+            lines.append(f"# HELP {prefix}_tokens_total Prompt and completion tokens per model.")
+            lines.append(f"# TYPE {prefix}_tokens_total counter")
+            for (model, kind), count in sorted(self.tokens.items()):
+                lines.append(f'{prefix}_tokens_total{{model="{_label(model)}",type="{kind}"}} {count}')
+            lines.append(f"# HELP {prefix}_step_errors_total Failed runs per step.")
+            lines.append(f"# TYPE {prefix}_step_errors_total counter")
+            for (kind, name), count in sorted(self.errors.items()):
+                lines.append(f'{prefix}_step_errors_total{{kind="{kind}",name="{_label(name)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write Prometheus text for *.prom / *.txt paths, JSON otherwise ('-' writes JSON to stderr)."""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json(indent=2)
+        if path == "-":
+            print(text, file=sys.stderr)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# Shared by the entry points
+perf_handler = PerfCallbackHandler()
+
+
+def perf_config(config: Optional[dict] = None, **kwargs: Any) -> dict:
+    """`config` (a RunnableConfig dict) with perf_handler added to its callbacks."""
+    config = dict(config or {}, **kwargs)
+    config["callbacks"] = list(config.get("callbacks") or []) + [perf_handler]
+    return config
+
+
+if os.getenv("PERF_METRICS"):
+    atexit.register(perf_handler.write, os.getenv("PERF_METRICS"))
@@ -1,11 +1,10 @@
 from langchain.chains.summarize.map_reduce_prompt import prompt_template
 from langchain.prompts import PromptTemplate
-import os
 import streamlit as st
-from langchain_openai import ChatOpenAI
+from streamlit_helpers import chat_model, stream_answer
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
+# Built once per server process, not on every rerun
+llm = chat_model("gpt-4o")
 
 prompt_template=PromptTemplate(
     input_variables=["country", "no_of_paras", "language"],
@@ -25,5 +24,4 @@ language = st.text_input ("enter the language")
 
 
 if country:
-    response = llm.invoke(prompt_template.format(country=country, no_of_paras=no_of_paras, language=language))
-    st.write(response.content)
+    stream_answer(llm, prompt_template.format(country=country, no_of_paras=no_of_paras, language=language))
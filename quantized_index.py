@@ -0,0 +1,148 @@
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+# =============================
+# Quantized candidate search
+# =============================
+# Compressed copies of a NumpyVectorStore's vectors:
+#   int8    one byte per dimension, scaled per dimension (4x smaller than float32)
+#   binary  one bit per dimension, the sign (32x smaller); scored by popcount
+# A query is scored against the codes to pick `k * rescore_factor` candidates.
+# Only those rows of the full-precision matrix are read and rescored. With
+# the matrix memory-mapped (NumpyVectorStore.load), only the codes need to
+# stay resident.
+
+_BLOCK = 65536
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int32)
+    return _POPCOUNT[bits].sum(axis=-1, dtype=np.int32)
+
+
+class QuantizedIndex:
+    """int8 or binary codes for candidate generation, rescored at full precision."""
+
+    def __init__(self, mode: str = "int8", rescore_factor: int = 4):
+        if mode not in ("int8", "binary"):
+            raise ValueError(f"Unknown quantization mode: {mode!r}")
+        self.mode = mode
+        self.rescore_factor = rescore_factor
+        self.scale: Optional[np.ndarray] = None
+        self.codes: Optional[np.ndarray] = None
+        self.dim = 0
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.mode == "binary":
+            return np.packbits(vectors > 0, axis=-1)
+        return np.clip(np.rint(vectors / self.scale), -127, 127).astype(np.int8)
+
+    def fit(self, vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.dim = vectors.shape[1]
+        if self.mode == "int8":
+            peak = np.abs(vectors).max(axis=0) if len(vectors) else np.ones(self.dim, dtype=np.float32)
+            self.scale = np.maximum(peak, 1e-6) / 127.0
+        blocks = [self._encode(vectors[s:s + _BLOCK]) for s in range(0, len(vectors), _BLOCK)]
+        self.codes = np.concatenate(blocks) if blocks else self._encode(vectors)
+
+    def add(self, vectors: np.ndarray):
+        self.codes = np.concatenate([self.codes, self._encode(vectors)])
+
+    def remap(self, keep: Sequence[int]):
+        self.codes = self.codes[np.asarray(keep, dtype=np.int64)]
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + (self.scale.nbytes if self.scale is not None else 0))
+
+    def _code_scores(self, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(self.codes), dtype=np.float32)
+        if self.mode == "binary":
+            query_bits = np.packbits(query > 0)
+            for s in range(0, len(self.codes), _BLOCK):
+                hamming = _popcount(np.bitwise_xor(self.codes[s:s + _BLOCK], query_bits))
+                scores[s:s + _BLOCK] = self.dim - 2 * hamming
+        else:
+            # NumPy integer matmul does not use BLAS, so widen small blocks of codes to float32 instead
+            weights = (query * self.scale).astype(np.float32)
+            block = max(1, (1 << 22) // self.dim)
+            for s in range(0, len(self.codes), block):
+                scores[s:s + block] = self.codes[s:s + block].astype(np.float32) @ weights
+        return scores
+
+    def search(self, matrix: np.ndarray, query: np.ndarray, k: int, rescore_factor: Optional[int] = None):
+        """Return (rows, scores) of the top-k rows; scores are exact cosine similarities."""
+        n_candidates = min(len(self.codes), k * (rescore_factor or self.rescore_factor))
+        code_scores = self._code_scores(query)
+        if n_candidates < len(code_scores):
+            candidates = np.argpartition(-code_scores, n_candidates)[:n_candidates]
+        else:
+            candidates = np.arange(len(code_scores))
+        candidates.sort()  # sequential reads from a memory-mapped matrix
+        exact = matrix[candidates] @ query
+        top = np.argsort(-exact)[:k]
+        return candidates[top], exact[top]
+
+    def save(self, path: str):
+        np.savez(path, mode=self.mode, codes=self.codes, dim=self.dim, rescore_factor=self.rescore_factor,
+                 scale=self.scale if self.scale is not None else np.zeros(0, dtype=np.float32))
+
+    @classmethod
+    def load(cls, path: str) -> "QuantizedIndex":
+        data = np.load(path)
+        index = cls(mode=str(data["mode"]), rescore_factor=int(data["rescore_factor"]))
+        index.codes = data["codes"]
+        index.dim = int(data["dim"])
+        index.scale = data["scale"] if index.mode == "int8" else None
+        return index
+
+
+def quantization_report(store, query_vectors: np.ndarray, k: int = 10,
+                        modes: Sequence[str] = ("int8", "binary"), rescore_factors: Sequence[int] = (1, 4, 10)):
+    """Memory saved and recall@k lost by each quantization mode, against exact float32 search."""
+    queries = np.asarray(query_vectors, dtype=np.float32)
+    queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    n, dim = store.matrix.shape
+
+    start = time.perf_counter()
+    exact = [set(store._top_rows(q, k)[0].tolist()) for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    report = [{"mode": "float64 lists (InMemoryVectorStore)", "bytes": n * dim * 8},
+              {"mode": "float32 matrix", "bytes": n * dim * 4, "recall": 1.0, "query_ms": round(exact_ms, 3)}]
+    for mode in modes:
+        index = QuantizedIndex(mode)
+        index.fit(store.matrix)
+        for factor in rescore_factors:
+            start = time.perf_counter()
+            found = [index.search(store.matrix, q, k, factor)[0] for q in queries]
+            query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+            recall = np.mean([len(truth.intersection(rows.tolist())) / len(truth) for truth, rows in zip(exact, found)])
+            report.append({"mode": mode, "rescore_factor": factor, "bytes": index.nbytes,
+                           "saved_vs_float32": f"{1 - index.nbytes / (n * dim * 4):.1%}",
+                           "recall": round(float(recall), 4), "query_ms": round(query_ms, 3)})
+    return report
+
+
+if __name__ == "__main__":
+    # Memory/recall trade-off on synthetic vectors shaped like text-embedding-3-large (no API calls)
+    import json
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from numpy_vector_store import NumpyVectorStore
+
+    rng = np.random.default_rng(0)
+    n, dim = 20_000, 3072
+    centers = rng.normal(size=(500, dim)).astype(np.float32)
+    vectors = centers[rng.integers(len(centers), size=n)] + rng.normal(scale=1.0, size=(n, dim)).astype(np.float32)
+
+    store = NumpyVectorStore(DeterministicFakeEmbedding(size=dim))
+    store.add_embeddings([str(i) for i in range(n)], vectors, ids=[str(i) for i in range(n)])
+    queries = centers[rng.integers(len(centers), size=100)] + rng.normal(scale=1.0, size=(100, dim))
+    for row in quantization_report(store, queries):
+        print(json.dumps(row))
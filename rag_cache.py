@@ -0,0 +1,102 @@
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ttl_cache import TTLCache
+
+# =============================
+# RAG caches
+# =============================
+# Two cache levels for the retrieve -> generate graph:
+#   QueryEmbeddingCache  LRU over query embeddings, so a repeated question
+#                        skips the embedding round-trip in `retrieve`.
+#   AnswerCache          answers keyed on the normalised question plus the ids
+#                        of the retrieved chunks. Near-duplicate questions that
+#                        retrieved the same chunks can also hit when their
+#                        embeddings are similar enough. The whole cache is
+#                        dropped when the index version changes.
+
+
+def normalize_question(question: str) -> str:
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+
+class QueryEmbeddingCache(Embeddings):
+    """Embeddings wrapper that memoises embed_query in an LRU with TTL."""
+
+    def __init__(self, underlying: Embeddings, maxsize: int = 1024, ttl: Optional[float] = 3600):
+        self.underlying = underlying
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.underlying.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.underlying.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self.cache.set(text, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = await self.underlying.aembed_query(text)
+            self.cache.set(text, vector)
+        return vector
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+class AnswerCache:
+    """Answer cache keyed on (normalised question, retrieved chunk ids)."""
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = 3600,
+                 similarity_threshold: Optional[float] = None):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.similarity_threshold = similarity_threshold
+        self.index_version = None
+        self.near_hits = 0
+
+    def _check_version(self, index_version):
+        # Any change to the index may change what the right answer is
+        if index_version != self.index_version:
+            self.cache.clear()
+            self.index_version = index_version
+
+    def get(self, question: str, chunk_ids: Sequence[str], query_vector: Optional[Sequence[float]] = None,
+            index_version=None) -> Optional[str]:
+        self._check_version(index_version)
+        chunks = tuple(sorted(chunk_ids))
+        entry = self.cache.get((normalize_question(question), chunks))
+        if entry is not None:
+            return entry[0]
+        if self.similarity_threshold is None or query_vector is None:
+            return None
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        for (_, cached_chunks), (answer, vector) in self.cache.items():
+            if cached_chunks == chunks and vector is not None and float(vector @ query) >= self.similarity_threshold:
+                self.near_hits += 1
+                return answer
+        return None
+
+    def set(self, question: str, chunk_ids: Sequence[str], answer: str,
+            query_vector: Optional[Sequence[float]] = None, index_version=None):
+        self._check_version(index_version)
+        vector = None
+        if query_vector is not None:
+            vector = np.asarray(query_vector, dtype=np.float32)
+            vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        self.cache.set((normalize_question(question), tuple(sorted(chunk_ids))), (answer, vector))
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "near_hits": self.near_hits}
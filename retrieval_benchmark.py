@@ -0,0 +1,275 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import random
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from listing_fields import ListingTable
+from numpy_vector_store import NumpyVectorStore
+
+# =============================
+# Retrieval benchmark
+# =============================
+# Offline benchmark of the retrieval path shared by the RAG scripts:
+# synthetic listings in the job_listings.txt format -> the same per-listing
+# 200/10 chunking the RAG scripts index (ListingTable.chunk_documents) -> each
+# vector store backend. Embeddings come from the deterministic fake embedder,
+# so no API calls are made and runs are repeatable. For every corpus size and
+# backend it records chunking time, build time, query latency percentiles, the
+# memory the built store holds and recall@k against exact search. Results are
+# written as JSON for regression checks.
+# The fake vectors have no cluster structure, so IVF and binary recall here
+# is a pessimistic lower bound compared with real embeddings.
+#
+# Each backend is built and queried in a forked worker. store_mb is how much
+# that worker's resident memory grew during the build, so native allocations
+# (Chroma's index) count, and so do the pages of shared chunk text the store
+# references. It needs /proc (Linux) and is null elsewhere.
+#
+# Vectors are generated in bulk into one float32 array (one row per distinct
+# chunk text) and the chunks are kept as id/text/metadata columns, so 10^6
+# listings fit in the memory of a workstation. The numpy backends take the
+# array through add_embeddings, as EmbeddingPipeline hands it over. The
+# pure-Python InMemoryVectorStore and Chroma are skipped above SIZE_CAPS.
+#
+#   python retrieval_benchmark.py --sizes 100 1000 10000 -o bench.json
+
+TITLES = ["Software Engineer", "Data Scientist", "Digital Marketing Specialist", "Project Manager",
+          "Graphic Designer", "Financial Analyst", "Human Resources Manager", "Cybersecurity Specialist",
+          "Sales Manager", "Content Writer", "DevOps Engineer", "Product Owner", "QA Analyst"]
+COMPANIES = ["TechCorp", "DataMinds", "MarketGurus", "BuildIt", "CreativeWorks", "FinExperts",
+             "PeopleFirst", "SecureNet", "RetailStars", "WordSmiths", "CloudNine", "Quantia"]
+DUTIES = ["developing and maintaining software applications", "analyzing large datasets",
+          "building predictive models", "managing online marketing campaigns", "overseeing projects",
+          "managing budgets", "designing marketing materials", "preparing reports",
+          "recruiting and onboarding", "monitoring for security breaches", "achieving sales targets",
+          "creating engaging content", "collaborating with cross-functional teams"]
+SKILLS = ["Java", "Python", "SQL", "R", "machine learning", "Google Analytics", "SEM", "leadership",
+          "Adobe Creative Suite", "financial modeling", "network security", "HR software", "Kubernetes",
+          "communication", "retail sales", "writing"]
+BACKENDS = ["inmemory", "chroma", "numpy", "numpy+ivf", "numpy+int8", "numpy+binary"]
+# Largest corpus (listings) per backend; InMemoryVectorStore scans Python lists on every query
+SIZE_CAPS = {"inmemory": 10_000, "chroma": 100_000}
+BUILD_BATCH = 200_000  # chunks per add; each NumpyVectorStore add concatenates the matrix once
+
+
+def write_synthetic_listings(path: str, n: int, seed: int = 0):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(1, n + 1):
+            duties = rng.sample(DUTIES, 3)
+            skills = rng.sample(SKILLS, 3)
+            f.write(f"{number}. {rng.choice(TITLES)} at {rng.choice(COMPANIES)} - Responsibilities include "
+                    f"{duties[0]}, {duties[1]}, and {duties[2]}. "
+                    f"Requires proficiency in {skills[0]}, {skills[1]}, and {skills[2]}.\n")
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Serves vectors computed up front, so build time measures the store rather than the embedder."""
+
+    def __init__(self, vectors: np.ndarray, row_of: Dict[str, int], fallback: Embeddings):
+        self.vectors = vectors
+        self.row_of = row_of
+        self.fallback = fallback
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        row = self.row_of.get(text)
+        return self.vectors[row].tolist() if row is not None else self.fallback.embed_query(text)
+
+
+@dataclass
+class Corpus:
+    """Chunk columns plus each chunk's row in the embeddings' vector array."""
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[dict]
+    rows: np.ndarray
+
+
+def _chroma_metadata(metadata: dict) -> dict:
+    # Chroma only takes scalar metadata values
+    return {key: ", ".join(value) if isinstance(value, list) else value for key, value in metadata.items()}
+
+
+def _documents(corpus: Corpus, start: int, stop: int, chroma: bool = False) -> List[Document]:
+    return [Document(id=corpus.ids[i], page_content=corpus.texts[i],
+                     metadata=_chroma_metadata(corpus.metadatas[i]) if chroma else corpus.metadatas[i])
+            for i in range(start, stop)]
+
+
+def _build(backend: str, embeddings: PrecomputedEmbeddings, corpus: Corpus, workdir: str):
+    n = len(corpus.ids)
+    if backend == "inmemory":
+        store = InMemoryVectorStore(embeddings)
+        for start in range(0, n, BUILD_BATCH):
+            store.add_documents(_documents(corpus, start, min(start + BUILD_BATCH, n)))
+    elif backend == "chroma":
+        from langchain_chroma import Chroma
+        store = Chroma(collection_name="bench", embedding_function=embeddings,
+                       persist_directory=os.path.join(workdir, "chroma"))
+        for start in range(0, n, 5000):  # Chroma caps the batch size
+            store.add_documents(_documents(corpus, start, min(start + 5000, n), chroma=True))
+    else:
+        store = NumpyVectorStore(embeddings)
+        for start in range(0, n, BUILD_BATCH):
+            stop = min(start + BUILD_BATCH, n)
+            store.add_embeddings(corpus.texts[start:stop], embeddings.vectors[corpus.rows[start:stop]],
+                                 metadatas=corpus.metadatas[start:stop], ids=corpus.ids[start:stop])
+        if backend == "numpy+ivf":
+            store.build_ann_index()
+        elif backend in ("numpy+int8", "numpy+binary"):
+            store.build_quantized_index(mode=backend.split("+")[1])
+    return store
+
+
+def _resident_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux /proc); None where that is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _in_worker(fn: Callable[[], dict]) -> dict:
+    """Run fn() in a forked child, so its memory growth belongs to one backend and is released afterwards."""
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:  # no fork (Windows): run in this process
+        return fn()
+    receiver, sender = context.Pipe(duplex=False)
+
+    def target():
+        try:
+            sender.send(fn())
+        except BaseException:
+            sender.send({"error": traceback.format_exc()})
+
+    process = context.Process(target=target)
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:  # killed, e.g. out of memory
+        process.join()
+        return {"failed": f"worker exited with code {process.exitcode}"}
+    process.join()
+    if "error" in result:
+        raise RuntimeError(f"Benchmark worker failed:\n{result['error']}")
+    return result
+
+
+def _bench_backend(backend: str, embeddings: PrecomputedEmbeddings, corpus: Corpus, workdir: str,
+                   query_vectors: List[List[float]], truth: List[set], k: int) -> dict:
+    gc.collect()
+    before = _resident_bytes()
+    start = time.perf_counter()
+    try:
+        store = _build(backend, embeddings, corpus, workdir)
+    except ImportError as exc:
+        return {"skipped": str(exc)}
+    build_seconds = time.perf_counter() - start
+    gc.collect()
+    after = _resident_bytes()
+
+    latencies, hits = [], 0
+    for vector, expected in zip(query_vectors, truth):
+        start = time.perf_counter()
+        found = store.similarity_search_by_vector(vector, k=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len({doc.id for doc in found} & expected) / k
+    return {
+        "build_s": round(build_seconds, 4),
+        "store_mb": round((after - before) / 2 ** 20, 2) if before is not None and after is not None else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        f"recall@{k}": round(min(1.0, hits / len(query_vectors)), 4),
+    }
+
+
+def run(sizes: List[int], backends: List[str], dim: int = 256, n_queries: int = 100, k: int = 4) -> dict:
+    splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=10)
+    fake = DeterministicFakeEmbedding(size=dim)
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "listings.txt")
+            write_synthetic_listings(path, size)
+            start = time.perf_counter()
+            ids, texts, metadatas = [], [], []
+            for chunk in ListingTable.from_file(path).chunk_documents(splitter):
+                ids.append(chunk.id)
+                texts.append(chunk.page_content)
+                metadatas.append(chunk.metadata)
+            chunk_seconds = time.perf_counter() - start
+
+            # Repeated chunk texts share a row, as they would share an embedding
+            row_of = {text: row for row, text in enumerate(dict.fromkeys(texts))}
+            vectors = np.random.default_rng(size).standard_normal((len(row_of), dim), dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            corpus = Corpus(ids, texts, metadatas, np.fromiter((row_of[text] for text in texts), dtype=np.int64,
+                                                               count=len(texts)))
+            embeddings = PrecomputedEmbeddings(vectors, row_of, fake)
+
+            rng = random.Random(size)
+            queries = [f"{rng.choice(TITLES)} requiring {rng.choice(SKILLS)}" for _ in range(n_queries)]
+            query_vectors = [fake.embed_query(query) for query in queries]
+            truth = []
+            for vector in query_vectors:
+                q = np.asarray(vector, dtype=np.float32)
+                scores = (vectors @ (q / np.linalg.norm(q)))[corpus.rows]
+                # Ties make the exact top-k ambiguous on duplicated synthetic chunks; compare by score threshold
+                threshold = np.partition(scores, len(scores) - k)[len(scores) - k] - 1e-6
+                truth.append({ids[i] for i in np.flatnonzero(scores >= threshold)})
+
+            for backend in backends:
+                if size > SIZE_CAPS.get(backend, size):
+                    results.append({"size": size, "backend": backend,
+                                    "skipped": f"above the {SIZE_CAPS[backend]}-listing cap for this backend"})
+                    print(json.dumps(results[-1]))
+                    continue
+                measured = _in_worker(lambda: _bench_backend(backend, embeddings, corpus, workdir,
+                                                             query_vectors, truth, k))
+                if "skipped" in measured or "failed" in measured:
+                    results.append({"size": size, "backend": backend, **measured})
+                else:
+                    results.append({"size": size, "backend": backend, "chunks": len(ids),
+                                    "chunk_s": round(chunk_seconds, 4), **measured})
+                print(json.dumps(results[-1]))
+    return {"meta": {"python": platform.python_version(), "numpy": np.__version__, "dim": dim,
+                     "queries": n_queries, "k": k, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vector store backends on synthetic listings.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="number of listings per corpus (10^2 .. 10^6)")
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.backends, args.dim, args.queries, args.k)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
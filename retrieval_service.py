@@ -0,0 +1,268 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterable, List, Optional, Tuple
+
+import requests
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from ttl_cache import TTLCache
+
+# =============================
+# Resident retrieval service
+# =============================
+# Builds the job-listings index once and serves it over local HTTP, so the
+# RAG scripts and Streamlit reruns only pay for a connection:
+#
+#   python retrieval_service.py --port 8765
+#   RETRIEVAL_SERVICE_URL=http://127.0.0.1:8765 python langchain_simple_rag.py
+#
+# Query embeddings from concurrent requests are collected for a few
+# milliseconds and sent to the provider as one batch.
+# RetrievalServiceClient is a VectorStore, so it drops into the existing
+# retrieve nodes, tools and as_retriever() calls.
+#
+#   POST /search      {"query" | "vector", "k", "ids"?, "mode": "vector" | "hybrid"}
+#   POST /embed       {"texts": [...]}
+#   GET  /health
+
+
+class EmbeddingBatcher(Embeddings):
+    """Embeddings wrapper that coalesces concurrent embed_query calls into one provider call.
+
+    Documents go to the wrapped embeddings unchanged. Query batches skip its
+    on-disk cache (if any) and go to the raw provider behind an in-memory LRU.
+    """
+
+    def __init__(self, embeddings: Embeddings, window: float = 0.005, max_batch: int = 64,
+                 cache_size: int = 4096):
+        self.embeddings = embeddings
+        self.query_embeddings = getattr(embeddings, "underlying", embeddings)
+        self.window = window
+        self.max_batch = max_batch
+        self.cache = TTLCache(maxsize=cache_size, ttl=3600)
+        self.batches = 0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        threading.Thread(target=self._run, name="embedding-batcher", daemon=True).start()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(text)
+        if vector is None:
+            future = Future()
+            self._queue.put((text, future))
+            vector = future.result()
+            self.cache.set(text, vector)
+        return vector
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            texts = list(dict.fromkeys(text for text, _ in pending))
+            try:
+                vectors = dict(zip(texts, self.query_embeddings.embed_documents(texts)))
+                self.batches += 1
+            except Exception as exc:
+                for _, future in pending:
+                    future.set_exception(exc)
+                continue
+            for text, future in pending:
+                future.set_result(vectors[text])
+
+
+def make_server(vector_store, hybrid=None, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP front for `vector_store`, whose embeddings should be an EmbeddingBatcher."""
+    stats = {"requests": 0}
+    batcher = vector_store.embeddings
+
+    def _search(body: dict) -> dict:
+        k = int(body.get("k", 4))
+        if body.get("mode") == "hybrid" and hybrid is not None and "query" in body:
+            docs = hybrid.search(body["query"], k=k)
+            results = [(doc, None) for doc in docs]
+        else:
+            vector = body.get("vector") or batcher.embed_query(body["query"])
+            results = vector_store.similarity_search_with_score_by_vector(vector, k=k, ids=body.get("ids"))
+        return {"version": vector_store.version,
+                "documents": [{"id": doc.id, "page_content": doc.page_content, "metadata": doc.metadata,
+                               "score": score} for doc, score in results]}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so clients reuse one connection
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: dict):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send(404, {"error": "not found"})
+                return
+            self._send(200, {"documents": len(vector_store), "version": vector_store.version,
+                             "embed_batches": getattr(batcher, "batches", None), **stats})
+
+        def do_POST(self):
+            stats["requests"] += 1
+            try:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+                if self.path == "/search":
+                    self._send(200, _search(body))
+                elif self.path == "/embed":
+                    self._send(200, {"vectors": [batcher.embed_query(text) for text in body["texts"]]})
+                else:
+                    self._send(404, {"error": "not found"})
+            except Exception as exc:
+                self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+# =============================
+# Client
+# =============================
+
+class _ServiceEmbeddings(Embeddings):
+    def __init__(self, client: "RetrievalServiceClient"):
+        self.client = client
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.client._post("/embed", {"texts": texts})["vectors"]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class RetrievalServiceClient(VectorStore):
+    """Read-only VectorStore backed by a running retrieval service."""
+
+    def __init__(self, url: str, mode: str = "vector", timeout: float = 30.0):
+        self.url = url.rstrip("/")
+        self.mode = mode
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._embeddings = _ServiceEmbeddings(self)
+        self._version = None
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embeddings
+
+    @property
+    def version(self) -> int:
+        # Fetched on first use, so importing a script that builds a client never blocks on the service
+        if self._version is None:
+            response = self.session.get(f"{self.url}/health", timeout=self.timeout)
+            response.raise_for_status()
+            self._version = response.json()["version"]
+        return self._version
+
+    def _post(self, path: str, body: dict) -> dict:
+        response = self.session.post(f"{self.url}{path}", json=body, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _search(self, body: dict) -> List[Tuple[Document, Optional[float]]]:
+        result = self._post("/search", body)
+        # Lets answer caches notice that the service's index changed
+        self._version = result["version"]
+        return [(Document(id=d["id"], page_content=d["page_content"], metadata=d["metadata"]), d["score"])
+                for d in result["documents"]]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any):
+        return self._search({"query": query, "k": k, "ids": kwargs.get("ids"), "mode": kwargs.get("mode", self.mode)})
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self._search({"vector": list(embedding), "k": k, "ids": kwargs.get("ids")})]
+
+    def search(self, query: str, k: int = 4) -> List[Document]:
+        """Same call shape as HybridRetriever.search."""
+        return self.similarity_search(query, k)
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        raise NotImplementedError("The retrieval service index is read-only for clients")
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+        raise NotImplementedError("Start retrieval_service.py and connect with RetrievalServiceClient(url)")
+
+
+def index_listings(vector_store, path: str = "job_listings.txt"):
+    """Add the same listing index the RAG scripts build: per-listing chunks (ListingTable), cached embeddings."""
+    from langchain_openai import OpenAIEmbeddings
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from embedding_cache import PersistentEmbeddingCache
+    from embedding_pipeline import EmbeddingPipeline
+    from listing_fields import ListingTable
+
+    # Queries keep the client's retries; the pipeline backs off on 429s itself, so its client has none
+    index_embeddings = PersistentEmbeddingCache(OpenAIEmbeddings(model="text-embedding-3-large", max_retries=0))
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=10)
+    listing_table = ListingTable.from_file(path)
+    EmbeddingPipeline(index_embeddings, max_concurrency=4).index(vector_store,
+                                                                 listing_table.chunk_documents(text_splitter))
+
+
+def build_index(path: str = "job_listings.txt"):
+    from langchain_openai import OpenAIEmbeddings
+    from numpy_vector_store import NumpyVectorStore
+
+    vector_store = NumpyVectorStore(OpenAIEmbeddings(model="text-embedding-3-large"))
+    index_listings(vector_store, path)
+    return vector_store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the job-listings index over local HTTP.")
+    parser.add_argument("--listings", default="job_listings.txt")
+    parser.add_argument("--index", help="NumpyVectorStore path to memory-map, rebuilt when the listings change "
+                                         "(the RAG scripts use .listings_index)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    from hybrid_retriever import BM25Index, HybridRetriever
+    from numpy_vector_store import NumpyVectorStore, file_fingerprint
+
+    if args.index:
+        # Same fingerprint as the RAG scripts, so they can share one saved index
+        from langchain_openai import OpenAIEmbeddings
+        store = NumpyVectorStore.load_or_build(
+            args.index, OpenAIEmbeddings(model="text-embedding-3-large"),
+            file_fingerprint(args.listings, "listing chunks", 200, 10, "text-embedding-3-large"),
+            lambda vector_store: index_listings(vector_store, args.listings))
+    else:
+        store = build_index(args.listings)
+
+    # Every query embedding, including the hybrid retriever's, goes through the batcher
+    store.embedding = EmbeddingBatcher(store.embedding)
+    hybrid_retriever = HybridRetriever(store, BM25Index.from_documents(store.get_by_ids(store.ids)))
+    server = make_server(store, hybrid_retriever, args.host, args.port)
+    print(f"Retrieval service: {len(store)} chunks on http://{args.host}:{args.port}")
+    server.serve_forever()
@@ -1,12 +1,11 @@
 from langchain.chains.summarize.map_reduce_prompt import prompt_template
 from langchain.prompts import PromptTemplate
-import os
 import streamlit as st
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
+from streamlit_helpers import chat_model, stream_answer
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
+# Built once per server process, not on every rerun
+llm = chat_model("gpt-4o")
 
 topic_prompt_template=PromptTemplate(
     input_variables=["topic"],
@@ -25,15 +24,20 @@ speech_prompt_template=PromptTemplate(
                 """
 )
 
-first_chain = topic_prompt_template | llm | StrOutputParser()
-second_chain = speech_prompt_template | llm
-final_chain = first_chain | second_chain
+
+@st.cache_resource
+def build_final_chain():
+    first_chain = topic_prompt_template | llm | StrOutputParser()
+    second_chain = speech_prompt_template | llm
+    return first_chain | second_chain
+
+
+final_chain = build_final_chain()
 
 st.title("Speech Generator")
 topic = st.text_input("Enter the topic:")
 
 
 if topic:
-    response = final_chain.invoke({
-                                    "topic": topic})
-    st.write(response.content)
+    # The title is generated first; only the speech itself is streamed
+    stream_answer(final_chain, {"topic": topic})
@@ -1,11 +1,10 @@
 from langchain.chains.summarize.map_reduce_prompt import prompt_template
 from langchain.prompts import PromptTemplate
-import os
 import streamlit as st
-from langchain_openai import ChatOpenAI
+from streamlit_helpers import chat_model, stream_answer
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
+# Built once per server process, not on every rerun
+llm = chat_model("gpt-4o")
 
 prompt_template=PromptTemplate(
     input_variables=["country", "no_of_paras", "language"],
@@ -18,7 +17,13 @@ prompt_template=PromptTemplate(
     """
 )
 
-simplechain = prompt_template | llm
+
+@st.cache_resource
+def build_simplechain():
+    return prompt_template | llm
+
+
+simplechain = build_simplechain()
 
 st.title("Cuisine info")
 country = st.text_input("Enter the country:")
@@ -27,8 +32,7 @@ language = st.text_input ("enter the language")
 
 
 if country:
-    response = simplechain.invoke({
-                                    "country": country,
-                                     "no_of_paras": no_of_paras,
-                                     "language": language})
-    st.write(response.content)
+    stream_answer(simplechain, {
+                                "country": country,
+                                "no_of_paras": no_of_paras,
+                                "language": language})
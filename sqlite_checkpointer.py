@@ -0,0 +1,279 @@
+import atexit
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (WRITES_IDX_MAP, BaseCheckpointSaver, ChannelVersions, Checkpoint,
+                                       CheckpointMetadata, CheckpointTuple, get_checkpoint_id,
+                                       get_checkpoint_metadata)
+
+# =============================
+# Compacting SQLite checkpointer
+# =============================
+# MemorySaver keeps every checkpoint of every thread in process memory until
+# exit, and loses them all on restart. CompactingSqliteSaver keeps them in one
+# SQLite file instead:
+#   batching    put()/put_writes() rows are buffered and committed in one
+#               transaction when `batch_size` rows are pending, before any
+#               read, and at exit. One graph turn (several super-steps) is
+#               usually a single commit.
+#   retention   each (thread, namespace) keeps only its `keep_last` newest
+#               checkpoints and their writes; threads idle for longer than
+#               `thread_ttl` seconds are dropped. Compaction runs after each
+#               flush, only for the threads that flush touched.
+#   memory      nothing but the write buffer lives in the process, so memory
+#               stays flat however many threads and turns are stored.
+#   threads     any number of thread_ids share the file; one connection
+#               behind a lock serves concurrent graph runs (WAL mode).
+# Checkpoints are stored whole (channel values inline), so retention never
+# strands a checkpoint without its blobs. Graphs using DeltaChannel need the
+# parent chain and should not use keep_last.
+#
+#   graph = builder.compile(checkpointer=CompactingSqliteSaver(".rag_checkpoints.sqlite"))
+
+DEFAULT_CHECKPOINT_PATH = ".rag_checkpoints.sqlite"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS checkpoints (thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, "
+    "checkpoint_id TEXT NOT NULL, parent_checkpoint_id TEXT, type TEXT, checkpoint BLOB, "
+    "metadata_type TEXT, metadata BLOB, created_at REAL NOT NULL, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    "CREATE TABLE IF NOT EXISTS writes (thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, "
+    "checkpoint_id TEXT NOT NULL, task_id TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL, "
+    "type TEXT, value BLOB, task_path TEXT NOT NULL DEFAULT '', "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+    "CREATE INDEX IF NOT EXISTS checkpoints_by_age ON checkpoints (created_at)",
+)
+
+
+class CompactingSqliteSaver(BaseCheckpointSaver):
+    """LangGraph checkpointer on SQLite with batched writes and per-thread retention."""
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, keep_last: Optional[int] = 5,
+                 thread_ttl: Optional[float] = None, batch_size: int = 64, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.keep_last = keep_last
+        self.thread_ttl = thread_ttl
+        self.batch_size = batch_size
+        self._pending: List[Tuple[str, tuple]] = []
+        self._touched: Set[Tuple[str, str]] = set()
+        self._lock = threading.RLock()
+        self._counters = {"checkpoints_written": 0, "writes_written": 0, "flushes": 0,
+                          "checkpoints_pruned": 0, "threads_expired": 0}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")  # only takes effect on a new file
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+        atexit.register(self.close)
+
+    # ----- write buffer -----
+
+    def _queue(self, sql: str, params: tuple, thread_id: str, checkpoint_ns: str):
+        with self._lock:
+            self._pending.append((sql, params))
+            self._touched.add((thread_id, checkpoint_ns))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Commit buffered rows in one transaction, then compact the threads they touched."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, touched = self._pending, self._touched
+            self._pending, self._touched = [], set()
+            with self._conn:
+                for sql, params in pending:
+                    self._conn.execute(sql, params)
+                freed = self._compact(touched)
+            if freed:
+                # Outside the transaction: executescript steps the pragma until every free page is released
+                self._conn.executescript("PRAGMA incremental_vacuum;")
+            self._counters["flushes"] += 1
+
+    def _compact(self, touched: Set[Tuple[str, str]]) -> bool:
+        """Apply keep_last and thread_ttl; True if any rows were deleted."""
+        pruned, expired = 0, []
+        if self.keep_last is not None:
+            for thread_id, checkpoint_ns in touched:
+                old = [row[0] for row in self._conn.execute(
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?", (thread_id, checkpoint_ns, self.keep_last))]
+                for checkpoint_id in old:
+                    key = (thread_id, checkpoint_ns, checkpoint_id)
+                    self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                                       "AND checkpoint_id = ?", key)
+                    self._conn.execute("DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+                                       "AND checkpoint_id = ?", key)
+                pruned += len(old)
+        if self.thread_ttl is not None:
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?",
+                (time.time() - self.thread_ttl,))]
+            for thread_id in expired:
+                self._delete_thread_rows(thread_id)
+            self._counters["threads_expired"] += len(expired)
+        self._counters["checkpoints_pruned"] += pruned
+        return bool(pruned or expired)
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    # ----- BaseCheckpointSaver -----
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, checkpoint_blob = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        self._queue("INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+                    "parent_checkpoint_id, type, checkpoint, metadata_type, metadata, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                     type_, checkpoint_blob, metadata_type, metadata_blob, time.time()),
+                    thread_id, checkpoint_ns)
+        with self._lock:
+            self._counters["checkpoints_written"] += 1
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                 "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            # Regular writes are kept from the first attempt; special channels (errors, interrupts) overwrite
+            verb = "INSERT OR REPLACE" if idx < 0 else "INSERT OR IGNORE"
+            type_, blob = self.serde.dumps_typed(value)
+            self._queue(f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, "
+                        "type, value, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type_, blob, task_path),
+                        thread_id, checkpoint_ns)
+        with self._lock:
+            self._counters["writes_written"] += len(writes)
+
+    def _tuple(self, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, blob, metadata_type, metadata_blob = row
+        writes = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+            "AND checkpoint_id = ? ORDER BY task_path, task_id, idx", (thread_id, checkpoint_ns, checkpoint_id))
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                     "checkpoint_id": checkpoint_id}},
+            checkpoint=self.serde.loads_typed((type_, blob)),
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config=({"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                             "checkpoint_id": parent_id}} if parent_id else None),
+            pending_writes=[(task_id, channel, self.serde.loads_typed((value_type, value)))
+                            for task_id, channel, value_type, value in writes],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                 "metadata_type, metadata FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?")
+        params: tuple = (thread_id, checkpoint_ns)
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        with self._lock:
+            self.flush()
+            row = self._conn.execute(query + " ORDER BY checkpoint_id DESC LIMIT 1", params).fetchone()
+            return self._tuple(row) if row else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        query = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                 "metadata_type, metadata FROM checkpoints WHERE 1 = 1")
+        params: tuple = ()
+        if config:
+            query += " AND thread_id = ?"
+            params += (config["configurable"]["thread_id"],)
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                query += " AND checkpoint_ns = ?"
+                params += (checkpoint_ns,)
+            if checkpoint_id := get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params += (checkpoint_id,)
+        if before and (before_id := get_checkpoint_id(before)):
+            query += " AND checkpoint_id < ?"
+            params += (before_id,)
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(query + " ORDER BY checkpoint_id DESC", params).fetchall()
+            results = []
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    metadata = self.serde.loads_typed((row[6], row[7]))
+                    if not all(metadata.get(key) == value for key, value in filter.items()):
+                        continue
+                results.append(self._tuple(row))
+        yield from results
+
+    def _delete_thread_rows(self, thread_id: str):
+        self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+        self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self.flush()
+            with self._conn:
+                self._delete_thread_rows(thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Same scheme as InMemorySaver: increasing integer plus a random tie-breaker
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # The graph's async API runs the same (short, local) SQLite calls inline
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+    # ----- reporting -----
+
+    def stats(self) -> dict:
+        with self._lock:
+            self.flush()
+            threads, checkpoints = self._conn.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints").fetchone()
+            return dict(self._counters, threads=threads, checkpoints_stored=checkpoints)
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+from langchain_text_splitters import TextSplitter
+
+# =============================
+# Streaming ingestion
+# =============================
+# Reads a listings file in bounded blocks, splits each block lazily and hands
+# the chunks to a vector store in fixed-size batches. At most one batch is
+# being embedded while the next one is read and split, so peak memory does
+# not depend on the file size. iter_lines does the same one line at a time and
+# reports byte offsets, so a listing can be re-read later instead of kept.
+
+DEFAULT_BLOCK_SIZE = 1 << 20  # 1 MiB
+
+
+def iter_blocks(path: str, block_size: int = DEFAULT_BLOCK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield the file in blocks of roughly `block_size` characters, cut at line boundaries."""
+    carry = ""
+    with open(path, encoding=encoding) as f:
+        while True:
+            data = f.read(block_size)
+            if not data:
+                break
+            data = carry + data
+            cut = data.rfind("\n")
+            if cut == -1:
+                # A single line longer than a block: keep reading until it ends
+                carry = data
+                continue
+            carry = data[cut + 1:]
+            yield data[:cut + 1]
+    if carry:
+        yield carry
+
+
+def iter_lines(path: str, encoding: str = "utf-8") -> Iterator[Tuple[int, str]]:
+    """Yield (byte offset, stripped line) for every non-blank line, reading one buffered line at a time."""
+    offset = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            line = raw.decode(encoding).strip()
+            if line:
+                yield offset, line
+            offset += len(raw)
+
+
+def iter_chunks(path: str, text_splitter: TextSplitter,
+                block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Document]:
+    """Lazily yield chunk Documents with the same metadata TextLoader would attach."""
+    for block in iter_blocks(path, block_size):
+        for text in text_splitter.split_text(block):
+            yield Document(page_content=text, metadata={"source": path})
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def ingest(vector_store: VectorStore, chunks: Iterable[Document], batch_size: int = 64) -> int:
+    """Add chunks in batches, embedding batch N while batch N+1 is read and split."""
+    total = 0
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = None
+        for batch in batched(chunks, batch_size):
+            if pending is not None:
+                pending.result()
+            pending = executor.submit(vector_store.add_documents, batch)
+            total += len(batch)
+        if pending is not None:
+            pending.result()
+    return total
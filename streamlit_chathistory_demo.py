@@ -1,12 +1,13 @@
-import os
-from langchain_openai import ChatOpenAI
+import uuid
+
 import streamlit as st
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_community.chat_message_histories import StreamlitChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
+from chat_history import ChatSessions, SummarizingChatHistory
+from streamlit_helpers import chat_model, stream_answer
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
+# Built once per server process, not on every rerun
+llm = chat_model("gpt-4o")
 prompt_template = ChatPromptTemplate.from_messages(
 [
     ("system","You are a Agile Coach.Answer any questions "
@@ -16,25 +17,43 @@ prompt_template = ChatPromptTemplate.from_messages(
 ]
 )
 
-chain = prompt_template | llm
 
-history_for_chain = StreamlitChatMessageHistory()
+@st.cache_resource
+def build_chain():
+    return prompt_template | llm
 
-chain_with_history = RunnableWithMessageHistory(
-    chain,
-    lambda session_id : history_for_chain,
-    input_messages_key="input",
-    history_messages_key="chat_history"
-)
+
+@st.cache_resource
+def chat_sessions():
+    # One bounded, summarizing history per browser session; older turns are summarized by a cheaper model
+    summarizer = chat_model("gpt-4o-mini", temperature=0)
+    return ChatSessions(lambda: SummarizingChatHistory(summarizer, max_turns=4, max_tokens=2000))
+
+
+@st.cache_resource
+def build_chain_with_history():
+    return RunnableWithMessageHistory(
+        build_chain(),
+        chat_sessions(),
+        input_messages_key="input",
+        history_messages_key="chat_history"
+    )
+
+
+chain_with_history = build_chain_with_history()
+
+if "session_id" not in st.session_state:
+    st.session_state.session_id = str(uuid.uuid4())
+session_id = st.session_state.session_id
 
 st.title("Agile Guide")
 
 input = st.text_input("Enter the question:")
 
 if input:
-    response = chain_with_history.invoke({"input":input},
-                                         {"configurable":{"session_id":"abc123"}})
-    st.write(response.content)
+    stream_answer(chain_with_history, {"input": input}, {"configurable": {"session_id": session_id}})
 
+history_for_chain = chat_sessions()(session_id)
 st.write("HISTORY")
-st.write(history_for_chain)
+st.write(history_for_chain.messages)
+st.caption(str(history_for_chain.stats()))
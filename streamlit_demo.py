@@ -1,13 +1,11 @@
-import os
 import streamlit as st
-from langchain_openai import ChatOpenAI
+from streamlit_helpers import chat_model, stream_answer
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
+# Built once per server process, not on every rerun
+llm = chat_model("gpt-4o")
 
 st.title("Ask a question")
 question = st.text_input("What's your question?")
 
 if question:
-    response = llm.invoke(question)
-    st.write(response.content)
+    stream_answer(llm, question)
@@ -0,0 +1,37 @@
+import os
+from typing import Any, Iterator, Optional
+
+import streamlit as st
+
+from perf_callbacks import perf_config
+
+# =============================
+# Shared Streamlit app layer
+# =============================
+# Streamlit re-executes the whole script on every widget change. Models,
+# chains and agents built here are cached resources, so they are created once
+# per server process and shared by every session and rerun. Answers are
+# rendered with .stream(), so the first words appear as soon as the model
+# sends them instead of after the full completion.
+
+
+@st.cache_resource
+def chat_model(model: str = "gpt-4o", temperature: Optional[float] = None):
+    """One ChatOpenAI client (and connection pool) per model for the whole server process."""
+    from langchain_openai import ChatOpenAI
+
+    kwargs = {} if temperature is None else {"temperature": temperature}
+    # stream_usage keeps token counts in the perf metrics for streamed answers
+    return ChatOpenAI(model=model, api_key=os.getenv("OPENAI_API_KEY"), stream_usage=True, **kwargs)
+
+
+def _text_chunks(chunks) -> Iterator[str]:
+    for chunk in chunks:
+        text = getattr(chunk, "content", chunk)
+        if isinstance(text, str) and text:
+            yield text
+
+
+def stream_answer(runnable, inputs: Any, config: Optional[dict] = None) -> str:
+    """Render a chain or model's answer token by token; returns the full text."""
+    return st.write_stream(_text_chunks(runnable.stream(inputs, config=perf_config(config))))
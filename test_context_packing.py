@@ -0,0 +1,27 @@
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from context_packing import _strip_overlap, merge_passages
+
+
+def _chunks(texts):
+    return [Document(page_content=text, metadata={"listing_id": 1, "chunk": position})
+            for position, text in enumerate(texts)]
+
+
+def test_neighbours_without_overlap_are_joined_unchanged():
+    merged = merge_passages(_chunks(["location: Austin, TX", "Xavier Corp is hiring"]))
+    assert [doc.page_content for doc in merged] == ["location: Austin, TX Xavier Corp is hiring"]
+
+
+def test_partial_word_is_not_stripped():
+    assert _strip_overlap("knowledge of", "ofbeat projects") == "ofbeat projects"
+
+
+def test_splitter_overlap_is_stripped():
+    listing = ("Project Manager at BuildIt - Responsibilities include overseeing construction projects, "
+               "managing budgets, and coordinating with contractors. Requires strong leadership skills "
+               "and knowledge of project management software.")
+    texts = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=10).split_text(listing)
+    assert len(texts) > 1
+    assert merge_passages(_chunks(texts))[0].page_content == listing
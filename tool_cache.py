@@ -0,0 +1,170 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+from ttl_cache import TTLCache
+
+# =============================
+# Tool result cache
+# =============================
+# Weather changes within minutes, while geocodes and Wikipedia summaries are
+# stable for months. The agents still ask for the same cities and attractions
+# on every run. ToolResultCache keeps tool results in two tiers:
+#   memory   a TTLCache per tool (LRU, per-tool TTL)
+#   disk     one SQLite file shared by all tools, so results survive restarts
+# Concurrent calls with the same arguments wait for the first one instead of
+# all hitting the API (stampede protection). Results returned as ToolFailure
+# are passed through but never cached, so a transient outage is not remembered.
+#
+#   @tool
+#   @tool_cache.cached("weather", ttl=600)
+#   def get_weather(city: str) -> str: ...
+#
+# TOOL_CACHE_PATH="" keeps the cache in memory only.
+
+DEFAULT_TOOL_CACHE_PATH = ".tool_cache.sqlite"
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+
+
+class ToolFailure(str):
+    """A tool result describing a failure; the agent sees it as a normal string, the cache skips it."""
+
+
+def _normalize(value):
+    # "Stockholm " and "Stockholm" ask the same question. Case is kept: results echo their arguments
+    # ("Stockholm: clear sky"), so "stockholm" must not get back another caller's spelling.
+    return value.strip() if isinstance(value, str) else value
+
+
+class ToolResultCache:
+    """Two-tier (in-process LRU + SQLite) cache for tool results with per-tool TTLs."""
+
+    def __init__(self, path: Optional[str] = DEFAULT_TOOL_CACHE_PATH, maxsize: int = 1024):
+        self.path = path
+        self.maxsize = maxsize
+        self._memory: Dict[str, TTLCache] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS tool_results (tool TEXT NOT NULL, key TEXT NOT NULL, "
+                               "value TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (tool, key))")
+            self._conn.commit()
+
+    def _count(self, tool: str, counter: str):
+        with self._lock:
+            counters = self._counters.setdefault(tool, {"memory_hits": 0, "disk_hits": 0, "misses": 0,
+                                                        "coalesced": 0, "failures": 0})
+            counters[counter] += 1
+
+    def _disk_get(self, tool: str, key: str):
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM tool_results WHERE tool = ? AND key = ?",
+                                     (tool, key)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _disk_set(self, tool: str, key: str, value, expires_at: float):
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO tool_results (tool, key, value, expires_at) "
+                               "VALUES (?, ?, ?, ?)", (tool, key, json.dumps(value), expires_at))
+            self._conn.commit()
+
+    def get_or_call(self, tool: str, ttl: float, key: str, fn: Callable[[], object]):
+        """Cached result for (tool, key), calling `fn` at most once across concurrent callers on a miss."""
+        self._local.fetched = False
+        with self._lock:
+            memory = self._memory.setdefault(tool, TTLCache(maxsize=self.maxsize, ttl=ttl))
+        entry = memory.get(key)
+        if entry is not None and entry[0] > time.time():
+            self._count(tool, "memory_hits")
+            return entry[1]
+        if (entry := self._disk_get(tool, key)) is not None:
+            self._count(tool, "disk_hits")
+            memory.set(key, (entry[1], entry[0]))
+            return entry[0]
+
+        with self._lock:
+            future = self._inflight.get((tool, key))
+            leader = future is None
+            if leader:
+                future = self._inflight[(tool, key)] = Future()
+        if not leader:
+            self._count(tool, "coalesced")
+            return future.result()
+
+        self._count(tool, "misses")
+        self._local.fetched = True
+        try:
+            value = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            if isinstance(value, ToolFailure):
+                self._count(tool, "failures")
+            else:
+                expires_at = time.time() + ttl
+                memory.set(key, (expires_at, value))
+                self._disk_set(tool, key, value, expires_at)
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[(tool, key)]
+
+    def last_call_fetched(self) -> bool:
+        """Whether this thread's latest lookup called the underlying function (i.e. made the real request)."""
+        return getattr(self._local, "fetched", False)
+
+    def cached(self, tool: str, ttl: float):
+        """Decorator caching a tool function's result for `ttl` seconds, keyed by its normalized arguments.
+
+        Apply it under @tool so the tool keeps the function's name, docstring and signature.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = json.dumps([[_normalize(arg) for arg in args],
+                                  {name: _normalize(value) for name, value in sorted(kwargs.items())}])
+                return self.get_or_call(tool, ttl, key, lambda: fn(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            counters = {tool: dict(values) for tool, values in self._counters.items()}
+        for tool, values in counters.items():
+            lookups = values["memory_hits"] + values["disk_hits"] + values["misses"] + values["coalesced"]
+            values["hit_rate"] = round((lookups - values["misses"]) / lookups, 3) if lookups else 0.0
+        return counters
+
+    def clear(self, tool: Optional[str] = None):
+        with self._lock:
+            for name, memory in self._memory.items():
+                if tool is None or name == tool:
+                    memory.clear()
+            if self._conn is not None:
+                if tool is None:
+                    self._conn.execute("DELETE FROM tool_results")
+                else:
+                    self._conn.execute("DELETE FROM tool_results WHERE tool = ?", (tool,))
+                self._conn.commit()
+
+
+# Shared by the agent scripts
+tool_cache = ToolResultCache(os.getenv("TOOL_CACHE_PATH", DEFAULT_TOOL_CACHE_PATH) or None)
@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator, Optional, Tuple
+
+# =============================
+# LRU cache with TTL
+# =============================
+# Thread-safe, size-bounded LRU where every entry also expires after `ttl`
+# seconds. Hit/miss/eviction counters are kept so callers can report hit rates.
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after `ttl` seconds (None = never)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and self._expired(entry[0], time.monotonic()):
+                del self._data[key]
+                self.evictions += 1
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Snapshot of the live (non-expired) entries, without touching recency or counters."""
+        now = time.monotonic()
+        with self._lock:
+            return iter([(key, value) for key, (stored_at, value) in self._data.items()
+                         if not self._expired(stored_at, now)])
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": round(self.hit_rate, 3)}